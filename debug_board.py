@@ -8,11 +8,9 @@ o_coords = [(5,6),(5,7),(5,8),(5,9),(5,10)]
 x_coords = [(7,5),(7,6),(7,7),(7,8),(7,9),(7,10)]
 
 for x,y in o_coords:
-    g.board.grid[x][y] = g.ai_player
-    g.board.empty_cells -= 1
+    g.board.place_move(x, y, g.ai_player)
 for x,y in x_coords:
-    g.board.grid[x][y] = g.human_player
-    g.board.empty_cells -= 1
+    g.board.place_move(x, y, g.human_player)
 
 # Rebuild available moves set
 g.available_moves = {(i,j) for i in range(g.board.size) for j in range(g.board.size) if g.board.grid[i][j] == '.'}
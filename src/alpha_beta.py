@@ -1,157 +1,491 @@
 import src.constants as c
-import src.heuristics as eval
 import math
+import os
+import sys
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+# Transposition table entry flags
+EXACT = 0
+LOWER = 1  # score is a lower bound (the node failed high)
+UPPER = 2  # score is an upper bound (the node failed low)
+
+TT_SIZE = 1 << 20
+# Ordered candidate lists kept per position; cleared when this large
+MOVE_CACHE_SIZE = 1 << 16
+# Scores of rank_moves' quiet moves run from 0 to 3 * 10 + 3 * 5
+DECENT_SCORES = 46
+
+# Search bounds, shared so nodes don't negate math.inf on every call
+NEG_INF = -math.inf
+POS_INF = math.inf
+
+# Depth reduction of the null-move search
+NULL_MOVE_R = 2
+
+# Width of the null windows of PVS and the null-move search. Any width gives
+# the same results, as a score inside a window is exact; a narrower one only
+# cuts more. Scores stay far below the size where it would round away.
+NULL_WINDOW = 1e-6
+
+
+def just_above(score):
+    """Upper end of a null window above score, finite even for score = -inf."""
+    return score + NULL_WINDOW if score != NEG_INF else -sys.float_info.max
+
+
+def just_below(score):
+    """Lower end of a null window below score, finite even for score = inf."""
+    return score - NULL_WINDOW if score != POS_INF else sys.float_info.max
+
+# Searcher of a root-search worker process, set up by _init_worker
+_worker = None
+
+
+def _init_worker(game, heuristic, max_depth):
+    """
+    Give a worker process its own copy of the root position and a searcher
+    for it. The searcher lives as long as the pool, so its transposition
+    table and move-ordering tables carry over between root pairs and depths.
+    """
+    global _worker
+    _worker = AlphaBetaPruning(game, heuristic, max_depth)
+
+
+def _search_root_pair(pair, depth, alpha):
+    """
+    Play one root pair for the AI in the worker's position, search the reply
+    with the window (alpha, inf) and return (score, nodes explored, nodes pruned).
+    A score above alpha is exact; anything else only says the pair is no better.
+    """
+    searcher = _worker
+    game = searcher.game
+    searcher.nodes_explored = searcher.nodes_pruned = 0
+    orig_r, orig_c = game.last_row, game.last_col
+    searcher.place_pair(pair, game.ai_player)
+    if game.board.has_six(game.ai_player):
+        score = POS_INF
+    else:
+        score, _ = searcher.alpha_beta(game, depth - 1, alpha, POS_INF, False,
+                                       allow_null=True, check_win=False)
+    searcher.remove_pair(pair)
+    game.last_row, game.last_col = orig_r, orig_c
+    return score, searcher.nodes_explored, searcher.nodes_pruned
 
 class AlphaBetaPruning:
-    def __init__(self, game, heuristic, max_depth=c.ALPHA_BETA_DEPTH):
+    def __init__(self, game, heuristic, max_depth=c.ALPHA_BETA_DEPTH, time_limit=c.ALPHA_BETA_TIME_LIMIT,
+                 workers=c.ALPHA_BETA_WORKERS, null_move=c.ALPHA_BETA_NULL_MOVE,
+                 aspiration=c.ALPHA_BETA_ASPIRATION, root_partners=c.ALPHA_BETA_ROOT_PARTNERS,
+                 cancel=None):
         self.game = game
         self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.null_move = null_move
+        self.aspiration = aspiration
+        self.root_partners = root_partners
+        # Optional threading.Event: once set, the search winds down and its
+        # result is meaningless (the caller has given up on it)
+        self.cancel = cancel
+        self.completed_depth = 0
+        # Score of the deepest completed iteration (None when no search ran)
+        self.best_score = None
         self.heuristic = heuristic
         self.limit = 20
         self.nodes_explored = 0
         self.nodes_pruned = 0
         self.start_time = None
+        # Move ordering: two killer pairs per remaining depth, and a history
+        # score per cell that grows every time the cell is part of a cutoff
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        self.history = defaultdict(int)
+        # Transposition table: (board hash, maximizing) -> (depth, score, flag, best_moves)
+        self.tt = {}
+        # get_prioritized_moves results: (board hash, side to move, limit) -> moves
+        self.move_cache = {}
 
     def __evaluate_board(self, game, win, draw):
         if win:
             winner = game.board.grid[game.last_row][game.last_col]
-            return math.inf if winner == c.AI else -math.inf
+            return POS_INF if winner == game.ai_player else NEG_INF
         elif draw:
             return 0
         else:
-            if self.heuristic == c.EVAL1:
-                return eval.heuristic_1(game)
-            else:
-                return eval.heuristic_2(game)
+            # Anything but EVAL1 evaluates with heuristic_2, as it always has
+            return game.evaluate_position(c.EVAL1 if self.heuristic == c.EVAL1 else c.EVAL2)
 
     def check_threat_at_position(self, game, x, y, player):
-        original = game.board.grid[x][y]
-        game.board.grid[x][y] = player
-        
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
+        """
+        Return the longest line player would have through (x, y) by playing there.
+        Walks the board's flat, border-padded cells, so the stone does not have
+        to be placed and no bounds checks are needed.
+        """
+        board = game.board
+        cells = board.cells
+        code = board.codes[player]
+        width = board.width
+        origin = (x + 1) * width + y + 1
         max_consecutive = 0
         
-        for dx, dy in directions:
+        # Vertical, horizontal, diagonal, anti-diagonal
+        for step in (width, 1, width + 1, width - 1):
             count = 1
             # Count in positive direction
-            i, j = x + dx, y + dy
-            while (0 <= i < game.board.size and 0 <= j < game.board.size and 
-                   game.board.grid[i][j] == player):
+            i = origin + step
+            while cells[i] == code:
                 count += 1
-                i += dx
-                j += dy
+                i += step
             # Count in negative direction
-            i, j = x - dx, y - dy
-            while (0 <= i < game.board.size and 0 <= j < game.board.size and 
-                   game.board.grid[i][j] == player):
+            i = origin - step
+            while cells[i] == code:
                 count += 1
-                i -= dx
-                j -= dy
+                i -= step
             
-            max_consecutive = max(max_consecutive, count)
-            
-            if max_consecutive >= 6:  # Already winning
-                game.board.grid[x][y] = original
-                return max_consecutive
+            if count > max_consecutive:
+                max_consecutive = count
+                if max_consecutive >= 6:  # Already winning
+                    return max_consecutive
         
-        game.board.grid[x][y] = original
         return max_consecutive
 
-    def alpha_beta(self, game, depth, alpha, beta, maximizing_player):
+    def threats_at_position(self, game, x, y, player, opponent):
+        """
+        check_threat_at_position for both sides at once: return the longest
+        lines player and opponent would have through (x, y) by playing there.
+        A run next to (x, y) belongs to whoever owns the adjacent cell, so
+        each side of each direction is walked once, for that player only.
+        Like check_threat_at_position, a length stops changing once it
+        reaches six.
+        """
+        board = game.board
+        cells = board.cells
+        codes = board.codes
+        mine_code, theirs_code = codes[player], codes[opponent]
+        width = board.width
+        origin = (x + 1) * width + y + 1
+        mine = theirs = 0
+        
+        for step in (width, 1, width + 1, width - 1):
+            m = t = 1
+            # Positive direction
+            i = origin + step
+            code = cells[i]
+            if code == mine_code:
+                while cells[i] == code:
+                    m += 1
+                    i += step
+            elif code == theirs_code:
+                while cells[i] == code:
+                    t += 1
+                    i += step
+            # Negative direction
+            i = origin - step
+            code = cells[i]
+            if code == mine_code:
+                while cells[i] == code:
+                    m += 1
+                    i -= step
+            elif code == theirs_code:
+                while cells[i] == code:
+                    t += 1
+                    i -= step
+            
+            if mine < 6 and m > mine:
+                mine = m
+            if theirs < 6 and t > theirs:
+                theirs = t
+        
+        return mine, theirs
+
+    def alpha_beta(self, game, depth, alpha, beta, maximizing_player, allow_null=False, check_win=True,
+                   root=False):
+        """
+        Fail-soft alpha-beta search.
+
+        Returns a (score, best_moves) tuple. best_moves is the pair of stones
+        that produced the score at this node, or [] for terminal/leaf nodes.
+        allow_null lets this node try a null move; the root must pick a real
+        pair and two passes in a row prove nothing, so only the recursion sets it.
+        check_win=False skips the test for a finished game, for callers that
+        already know nobody has six (the nodes test every pair they place).
+        root=True marks the search's root, which tries root_pairs.
+        """
         self.nodes_explored += 1
+        if self.cancel is not None and self.cancel.is_set():
+            return 0, []
         
-        if game.last_row is not None and game.last_col is not None:
+        if check_win and game.last_row is not None and game.last_col is not None:
             win = game.check_winner(game.last_row, game.last_col)
         else:
             win = False
-        draw = game.is_draw()
+        # A draw needs a full board (or one cell left on an even board), so
+        # the empty-cell counter rules it out without the method calls
+        draw = game.board.empty_cells <= 1 and game.is_draw()
         
-        if (not depth) or draw or win:
-            return self.__evaluate_board(game, win, draw) 
-    
+        if draw or win:
+            return self.__evaluate_board(game, win, draw), []
+        if not depth:
+            # Quiescence check: a side to move that can complete six with its
+            # next pair has won, whatever the static evaluation says
+            if game.board.threatens_six(game.ai_player if maximizing_player else game.human_player):
+                return (POS_INF if maximizing_player else NEG_INF), []
+            return self.__evaluate_board(game, win, draw), []
+
+        key = (game.board.hash, maximizing_player)
+        entry = self.tt.get(key)
+        hint = None
+        if entry is not None:
+            entry_depth, entry_score, flag, hint = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_score, hint
+                if flag == LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score, hint
+
+        orig_alpha, orig_beta = alpha, beta
+        score = None
+        if allow_null and self.null_move and depth >= NULL_MOVE_R + 2:
+            score = self.null_move_search(game, depth, alpha, beta, maximizing_player)
+        if score is not None:
+            moves = []
+        elif maximizing_player:
+            score, moves = self.__max_node(game, depth, alpha, beta, hint, root)
+        else:
+            score, moves = self.__min_node(game, depth, alpha, beta, hint)
+
+        if score <= orig_alpha:
+            flag = UPPER
+        elif score >= orig_beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.store_tt(key, depth, score, flag, moves)
+        return score, moves
+
+    def null_move_search(self, game, depth, alpha, beta, maximizing_player):
+        """
+        Let the side to move pass and search the opponent's reply NULL_MOVE_R
+        plies shallower with a null window on the bound this node must beat.
+        Placing stones never hurts in Connect6, so if even passing fails high
+        (low for the minimizer) a real pair would too: return that score as
+        the cutoff, else None. Callers need depth >= NULL_MOVE_R + 2 so the
+        reduced search still sees an opponent pair that wins outright.
+        """
+        reduced = depth - 1 - NULL_MOVE_R
         if maximizing_player:
-            return self.__max_node(game, depth, alpha, beta)
+            if beta == POS_INF:
+                return None
+            score, _ = self.alpha_beta(game, reduced, just_below(beta), beta, False, check_win=False)
+            if score >= beta:
+                self.nodes_pruned += 1
+                return score
         else:
-            return self.__min_node(game, depth, alpha, beta)
+            if alpha == NEG_INF:
+                return None
+            score, _ = self.alpha_beta(game, reduced, alpha, just_above(alpha), True, check_win=False)
+            if score <= alpha:
+                self.nodes_pruned += 1
+                return score
+        return None
+
+    def store_tt(self, key, depth, score, flag, moves):
+        """Store a search result, keeping the deeper entry and evicting the oldest when full."""
+        tt = self.tt
+        old = tt.get(key)
+        if old is not None and old[0] > depth:
+            return
+        if old is None and len(tt) >= TT_SIZE:
+            del tt[next(iter(tt))]
+        tt[key] = (depth, score, flag, moves)
     
-    def __max_node(self, game, depth, alpha, beta):
-        max_score = -math.inf
-        orig_r, orig_c = game.last_row, game.last_col
+    def __max_node(self, game, depth, alpha, beta, hint=None, root=False):
+        max_score = NEG_INF
+        best_moves = None
+        # Every pair overwrites last_row/last_col, so restore them (and the
+        # side to move, which get_prioritized_moves reads) once at the end
+        orig_r, orig_c, orig_player = game.last_row, game.last_col, game.current_player
+        player = game.current_player = game.ai_player
+        # Locals for the loop below, which runs once per candidate pair
+        search, place_pair, remove_pair = self.alpha_beta, self.place_pair, self.remove_pair
+        has_six = game.board.has_six
         
         moves = self.get_prioritized_moves(game, self.limit)
+        pairs = self.root_pairs(game, moves, depth, hint) if root else self.ordered_pairs(moves, depth, hint)
         
-        for i in range(len(moves)):
-            x1, y1 = moves[i]
-            self.set_stone(x1, y1, c.AI)
+        for pair in pairs:
+            place_pair(pair, player)
             
-            for j in range(i + 1, len(moves)):
-                x2, y2 = moves[j]
-                self.set_stone(x2, y2, c.AI)
-                
-                score = self.alpha_beta(game, depth - 1, alpha, beta, False)
+            # A pair that completes six wins outright: no subtree to search
+            if has_six(player):
+                score = POS_INF
+            elif best_moves is None or depth == 1:
+                score, _ = search(game, depth - 1, alpha, beta, False, allow_null=True, check_win=False)
+            else:
+                # Principal variation search: with good ordering the first pair
+                # is the best, so later pairs only have to show they are no
+                # better than alpha, which a null window does cheaply. One that
+                # is better gets searched again with the real window.
+                score, _ = search(game, depth - 1, alpha, just_above(alpha), False,
+                                  allow_null=True, check_win=False)
+                if alpha < score < beta:
+                    score, _ = search(game, depth - 1, score, beta, False, allow_null=True, check_win=False)
 
-                self.remove_stone(x2, y2)
-                game.last_row = x1
-                game.last_col = y1
+            remove_pair(pair)
 
-                max_score = max(max_score, score)
-                alpha = max(alpha, score)
-                
-                if beta <= alpha:
-                    self.nodes_pruned += 1
-                    self.remove_stone(x1, y1)
-                    game.last_row = orig_r
-                    game.last_col = orig_c
-                    return max_score
-
-            self.remove_stone(x1, y1)
+            if best_moves is None or score > max_score:
+                max_score = score
+                best_moves = list(pair)
+            alpha = max(alpha, score)
+            
+            if beta <= alpha:
+                self.nodes_pruned += 1
+                self.record_cutoff(depth, pair)
+                break
 
-        game.last_row = orig_r
-        game.last_col = orig_c
-        return max_score
+        game.last_row, game.last_col, game.current_player = orig_r, orig_c, orig_player
+        return max_score, best_moves or []
         
-    def __min_node(self, game, depth, alpha, beta):
-        min_score = math.inf
-        orig_r, orig_c = game.last_row, game.last_col
+    def __min_node(self, game, depth, alpha, beta, hint=None):
+        min_score = POS_INF
+        best_moves = None
+        orig_r, orig_c, orig_player = game.last_row, game.last_col, game.current_player
+        player = game.current_player = game.human_player
+        search, place_pair, remove_pair = self.alpha_beta, self.place_pair, self.remove_pair
+        has_six = game.board.has_six
 
         moves = self.get_prioritized_moves(game, self.limit)
         
-        for i in range(len(moves)):
-            x1, y1 = moves[i]
-            self.set_stone(x1, y1, c.PLAYER)
+        for pair in self.ordered_pairs(moves, depth, hint):
+            place_pair(pair, player)
             
-            for j in range(i + 1, len(moves)):
-                x2, y2 = moves[j]
-                self.set_stone(x2, y2, c.PLAYER)
-                
-                score = self.alpha_beta(game, depth - 1, alpha, beta, True)
-    
-                self.remove_stone(x2, y2)
-                game.last_row = x1
-                game.last_col = y1
-    
-                min_score = min(min_score, score)
-                beta = min(beta, score)
-                
-                if beta <= alpha:
-                    self.nodes_pruned += 1
-                    self.remove_stone(x1, y1)
-                    game.last_row = orig_r
-                    game.last_col = orig_c
-                    return min_score
-    
-            self.remove_stone(x1, y1)
+            if has_six(player):
+                score = NEG_INF
+            elif best_moves is None or depth == 1:
+                score, _ = search(game, depth - 1, alpha, beta, True, allow_null=True, check_win=False)
+            else:
+                score, _ = search(game, depth - 1, just_below(beta), beta, True,
+                                  allow_null=True, check_win=False)
+                if alpha < score < beta:
+                    score, _ = search(game, depth - 1, alpha, score, True, allow_null=True, check_win=False)
+
+            remove_pair(pair)
+
+            if best_moves is None or score < min_score:
+                min_score = score
+                best_moves = list(pair)
+            beta = min(beta, score)
+            
+            if beta <= alpha:
+                self.nodes_pruned += 1
+                self.record_cutoff(depth, pair)
+                break
     
-        game.last_row = orig_r
-        game.last_col = orig_c
-        return min_score
+        game.last_row, game.last_col, game.current_player = orig_r, orig_c, orig_player
+        return min_score, best_moves or []
+
+    def ordered_pairs(self, moves, depth, hint=None):
+        """
+        Build every unordered pair of candidate stones for a node.
+        The transposition-table move (hint) is tried first, then killer pairs
+        for this depth, then pairs whose stones have the highest history score.
+        The sort is stable, so ties keep the threat-based order from
+        get_prioritized_moves.
+        """
+        pairs = [(a, b) if a < b else (b, a)
+                 for a, b in combinations(moves, 2)]
+
+        if hint and len(hint) == 2:
+            hint = tuple(sorted(hint))
+        killers = self.killers[depth]
+        history = self.history
+        pairs.sort(key=lambda p: (p == hint, p in killers, history[p[0]] + history[p[1]]), reverse=True)
+        return pairs
+
+    def root_pairs(self, game, moves, depth, hint=None):
+        """
+        ordered_pairs for the AI at the root. With self.root_partners set,
+        the root is forward pruned: a pair is kept only if one stone is among
+        the root_partners best candidates for a second stone once the other
+        is on the board, ranked as get_prioritized_moves ranks moves. Pairs
+        that complete six, and (when the human could complete six next turn)
+        every pair that stops that, are always kept, so pruning never loses
+        a win or the only defence against a double threat. So is the
+        transposition-table pair.
+        """
+        board, available = game.board, game.available_moves
+        # In the opening rank_moves only picks central cells, unranked, so
+        # there is no partner order to prune by
+        if not self.root_partners or len(available) - 1 >= board.size * board.size - 5:
+            return self.ordered_pairs(moves, depth, hint)
+        root_partners = self.root_partners
+        player, opponent = game.ai_player, game.human_player
+        orig_player = game.current_player
+        game.current_player = player
+        candidates = set(moves)
+        keep = set()
+        for first in moves:
+            board.place_move(first[0], first[1], player)
+            available.discard(first)
+            partners = [m for m in self.get_prioritized_moves(game) if m in candidates]
+            board.undo_move(first[0], first[1])
+            available.add(first)
+            for second in partners[:root_partners]:
+                keep.add((first, second) if first < second else (second, first))
+        game.current_player = orig_player
+        
+        # Keep every pair that wins or that takes away the human's six
+        can_win = board.threatens_six(player)
+        must_block = board.threatens_six(opponent)
+        if can_win or must_block:
+            for first, second in combinations(moves, 2):
+                board.place_move(first[0], first[1], player)
+                board.place_move(second[0], second[1], player)
+                if (can_win and board.has_six(player)) or (must_block and not board.threatens_six(opponent)):
+                    keep.add((first, second) if first < second else (second, first))
+                board.undo_move(second[0], second[1])
+                board.undo_move(first[0], first[1])
+        
+        if hint and len(hint) == 2:
+            keep.add(tuple(sorted(hint)))
+        return [pair for pair in self.ordered_pairs(moves, depth, hint) if pair in keep]
+
+    def record_cutoff(self, depth, pair):
+        """Remember a pair that caused a cutoff as a killer and in the history table."""
+        killers = self.killers[depth]
+        if killers[0] != pair:
+            killers[1] = killers[0]
+            killers[0] = pair
+        # Key history by the single stones so it carries over to other pairs
+        for move in pair:
+            self.history[move] += depth * depth
     
     def get_prioritized_moves(self, game, limit=None):
+        """
+        Return the candidate stones for the side to move, best first (see
+        rank_moves). Re-searches and transpositions reach the same position
+        again, so lists are cached by board hash and side to move. Callers
+        must not modify the returned list.
+        """
+        key = (game.board.hash, game.current_player, limit)
+        moves = self.move_cache.get(key)
+        if moves is None:
+            if len(self.move_cache) >= MOVE_CACHE_SIZE:
+                self.move_cache.clear()
+            moves = self.move_cache[key] = self.rank_moves(game, limit)
+        return moves
+
+    def rank_moves(self, game, limit=None):
         """
         Priority: Win > Block > Strong threats > Building
         """
-        all_moves = game.get_available_moves()
+        # The game's live set of empty cells; read-only here, so no copy
+        all_moves = game.available_moves
         
         if not all_moves:
             return []
@@ -162,8 +496,8 @@ class AlphaBetaPruning:
             return [(x, y) for x, y in all_moves 
                     if abs(x - center) <= 4 and abs(y - center) <= 4][:limit]
         
-        current_player = c.AI if game.current_player == c.AI else c.PLAYER
-        opponent = c.PLAYER if current_player == c.AI else c.AI
+        current_player = game.current_player
+        opponent = game.human_player if current_player == game.ai_player else game.ai_player
         
         # Categorize moves
         winning_moves = []
@@ -171,28 +505,19 @@ class AlphaBetaPruning:
         important_blocks = []  # Block 4-in-a-row
         strong_attacks = []   # Create 5-in-a-row
         good_attacks = []     # Create 4-in-a-row
-        decent_moves = []
-        
-        # Get relevant area
-        relevant = set()
-        for x in range(game.board.size):
-            for y in range(game.board.size):
-                if game.board.grid[x][y] != c.EMPTY:
-                    for dx in range(-3, 4):
-                        for dy in range(-3, 4):
-                            nx, ny = x + dx, y + dy
-                            if (0 <= nx < game.board.size and 
-                                0 <= ny < game.board.size and 
-                                game.board.grid[nx][ny] == c.EMPTY):
-                                relevant.add((nx, ny))
-        
-        moves_to_check = list(relevant) if relevant else all_moves
+        # Remaining moves bucketed by their score, my_threat * 10 + opp_threat * 5
+        # with both threats at most 3, so they are ordered without a sort
+        decent_moves = [[] for _ in range(DECENT_SCORES)]
+        
+        # Relevant area: empty cells near existing stones, maintained by the board
+        relevant = game.board.get_candidate_moves()
+        moves_to_check = relevant or all_moves
         
+        threats_at = self.threats_at_position
         for move in moves_to_check:
             x, y = move
             
-            my_threat = self.check_threat_at_position(game, x, y, current_player)
-            opp_threat = self.check_threat_at_position(game, x, y, opponent)
+            my_threat, opp_threat = threats_at(game, x, y, current_player, opponent)
             
             # Winning move
             if my_threat >= 6:
@@ -202,71 +527,72 @@ class AlphaBetaPruning:
                 critical_blocks.append((move, opp_threat))
             # Block opponent's 4-in-a-row
             elif opp_threat >= 4:
-                important_blocks.append((move, opp_threat))
+                important_blocks.append(move)
             # Create our 5-in-a-row
             elif my_threat >= 5:
-                strong_attacks.append((move, my_threat))
+                strong_attacks.append(move)
             # Create our 4-in-a-row
             elif my_threat >= 4:
-                good_attacks.append((move, my_threat))
+                good_attacks.append(move)
             else:
-                score = my_threat * 10 + opp_threat * 5
-                decent_moves.append((move, score))
+                decent_moves[my_threat * 10 + opp_threat * 5].append(move)
         
-        # Sort by priority
+        # Critical blocks are rare, and filling a gap can give the opponent
+        # a line longer than six, so they are still sorted by its length
         critical_blocks.sort(key=lambda x: x[1], reverse=True)
-        important_blocks.sort(key=lambda x: x[1], reverse=True)
-        strong_attacks.sort(key=lambda x: x[1], reverse=True)
-        good_attacks.sort(key=lambda x: x[1], reverse=True)
-        decent_moves.sort(key=lambda x: x[1], reverse=True)
         
-        # Combine in priority order
+        # Combine in priority order, highest scores first. Every move lands in
+        # exactly one list and moves within a list keep the order they were
+        # checked in, as the stable sorts this replaces did.
         result = (
             winning_moves +
             [m for m, _ in critical_blocks] +
-            [m for m, _ in important_blocks] +
-            [m for m, _ in strong_attacks] +
-            [m for m, _ in good_attacks] +
-            [m for m, _ in decent_moves]
+            important_blocks +
+            strong_attacks +
+            good_attacks
         )
+        for bucket in reversed(decent_moves):
+            if limit and len(result) >= limit:
+                break
+            result += bucket
         
-        # Remove duplicates
-        seen = set()
-        unique = []
-        for m in result:
-            if m not in seen:
-                seen.add(m)
-                unique.append(m)
-        
-        return unique[:limit] if limit else unique
+        return result[:limit] if limit else result
         
     def find_best_move(self, game):
         # Reset and start timing
         self.nodes_explored = 0
         self.nodes_pruned = 0
-        self.start_time = time.time()
+        self.best_score = None
+        self.start_time = time.monotonic()
         
         if game.first_move:
             center = game.board.size // 2
             return [(center, center)]
         
         moves = self.get_prioritized_moves(game, self.limit)
-        current_player = c.AI
-        opponent = c.PLAYER
-        
-        # IMMEDIATE WIN CHECK
-        for i in range(len(moves)):
-            x1, y1 = moves[i]
-            if self.check_threat_at_position(game, x1, y1, current_player) >= 6:
-                return [(x1, y1), moves[0] if moves[0] != (x1, y1) else moves[1]]
-            
-            self.set_stone(x1, y1, current_player)
-            for j in range(i + 1, len(moves)):
-                x2, y2 = moves[j]
-                if self.check_threat_at_position(game, x2, y2, current_player) >= 6:
-                    self.remove_stone(x1, y1)
-                    return [(x1, y1), (x2, y2)]
-            self.remove_stone(x1, y1)
+        current_player = game.ai_player
+        opponent = game.human_player
+        
+        # IMMEDIATE WIN CHECK - only when some window can be completed this
+        # turn; otherwise no pair wins and the scan below would find nothing
+        if game.board.threatens_six(current_player):
+            # The threat test only reads the board's cells, so the first stone
+            # goes straight onto the board: no last move or move set to restore
+            board = game.board
+            threat_at = self.check_threat_at_position
+            n = len(moves)
+            for i in range(n):
+                x1, y1 = moves[i]
+                if threat_at(game, x1, y1, current_player) >= 6:
+                    return [(x1, y1), moves[0] if moves[0] != (x1, y1) else moves[1]]
+                
+                board.place_move(x1, y1, current_player)
+                for j in range(i + 1, n):
+                    x2, y2 = moves[j]
+                    if threat_at(game, x2, y2, current_player) >= 6:
+                        board.undo_move(x1, y1)
+                        return [(x1, y1), (x2, y2)]
+                board.undo_move(x1, y1)
         
         # CRITICAL BLOCK CHECK - if opponent has 5-in-a-row threat, MUST block!
         critical_threats = []
@@ -288,51 +614,130 @@ class AlphaBetaPruning:
                 block2 = moves[1] if moves[1] != block1 else moves[2]
             return [block1, block2]
         
-        # Normal alpha-beta search
-        best_score = -math.inf
-        best_moves = None
-        alpha = -math.inf
-        beta = math.inf
-        
-        for i in range(min(len(moves), 20)):
-            x1, y1 = moves[i]
-            self.set_stone(x1, y1, c.AI)
-            
-            for j in range(i + 1, min(len(moves), 20)):
-                x2, y2 = moves[j]
-                self.set_stone(x2, y2, c.AI)
-                
-                score = self.alpha_beta(game, self.max_depth - 1, alpha, beta, False)
-                
-                self.remove_stone(x2, y2)
-                game.last_row = x1
-                game.last_col = y1
-                
-                if score > best_score:
-                    best_score = score
-                    best_moves = [(x1, y1), (x2, y2)]
-                
-                alpha = max(alpha, score)
-            
-            self.remove_stone(x1, y1)
+        # Iterative deepening. Each iteration stores its best pair in the
+        # transposition table, so the next (deeper) iteration tries that
+        # principal variation first at the root. Stop starting new iterations
+        # once the time budget is spent and keep the deepest completed result.
+        # With several workers the root pairs of each deeper iteration are
+        # searched in parallel processes instead (see search_root_parallel).
+        best_score, best_moves = NEG_INF, None
+        scores = []
+        pool = None
+        if self.workers > 1 and self.max_depth > 1:
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                       initargs=(game, self.heuristic, self.max_depth))
+        try:
+            for depth in range(1, self.max_depth + 1):
+                if pool is not None and depth > 1:
+                    score, pv = self.search_root_parallel(game, depth, pool)
+                else:
+                    guess = scores[-2] if len(scores) >= 2 else None
+                    score, pv = self.aspiration_search(game, depth, guess)
+                scores.append(score)
+                if pv:
+                    best_score, best_moves = score, pv
+                    self.best_score = score
+                self.completed_depth = depth
+                if score == POS_INF or time.monotonic() - self.start_time > self.time_limit:
+                    break
+                if self.cancel is not None and self.cancel.is_set():
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
         
         # Print Console Details :)) (ya rb fok el dy2a)
-        elapsed_time = time.time() - self.start_time
-        
-        print(f"==== Alpha Beta at depth {self.max_depth} ====")
-        print(f"Nodes Explored: {self.nodes_explored:,}")
-        print(f"Pruned {self.nodes_pruned:} times")
-        print(f"Time Taken: {elapsed_time:.2f} seconds")
-        print(f"Best Move Returned From AlphaBetaPurning Class: {best_moves}")
-        print(f"Best Score: {best_score}")
+        if c.DEBUG:
+            elapsed_time = time.monotonic() - self.start_time
+            sys.stdout.write(
+                f"==== Alpha Beta at depth {self.completed_depth}/{self.max_depth} ====\n"
+                f"Nodes Explored: {self.nodes_explored:,}\n"
+                f"Pruned {self.nodes_pruned:} times\n"
+                f"Time Taken: {elapsed_time:.2f} seconds\n"
+                f"Best Move Returned From AlphaBetaPurning Class: {best_moves}\n"
+                f"Best Score: {best_score}\n"
+            )
         return best_moves if best_moves else [moves[0], moves[1]]
 
-    def set_stone(self, x, y, stone):
-        self.game.board.grid[x][y] = stone
-        self.game.last_row = x
-        self.game.last_col = y
-        self.game._remove_move(x, y)
-    
-    def remove_stone(self, x, y):
-        self.game.board.grid[x][y] = c.EMPTY
-        self.game._add_move(x, y)
\ No newline at end of file
+    def aspiration_search(self, game, depth, guess):
+        """
+        Search the root with a window of +/- self.aspiration around guess (the
+        score from two iterations back, of the same parity: odd and even depths
+        end on different sides and their scores swing). A narrow window cuts
+        more, and the score rarely moves far between same-parity iterations;
+        when it falls outside, the side it failed on is opened up and the root
+        searched again.
+        """
+        if not self.aspiration or guess is None or guess in (NEG_INF, POS_INF):
+            return self.alpha_beta(game, depth, NEG_INF, POS_INF, True, root=True)
+        
+        alpha, beta = guess - self.aspiration, guess + self.aspiration
+        score, pv = self.alpha_beta(game, depth, alpha, beta, True, root=True)
+        # Fail-soft: a score outside the window is a bound on the true score
+        if score <= alpha:
+            score, pv = self.alpha_beta(game, depth, NEG_INF, score + 1, True, root=True)
+        elif score >= beta:
+            score, pv = self.alpha_beta(game, depth, score - 1, POS_INF, True, root=True)
+        return score, pv
+
+    def search_root_parallel(self, game, depth, pool):
+        """
+        Search the root pairs in the worker pool and return (score, best pair).
+        Young Brothers Wait: the first pair (the previous iteration's best) is
+        searched alone, and every later pair gets the best score so far as its
+        alpha. Only one pair per worker is in flight, so later pairs start with
+        tighter bounds. Results are taken in root order, so ties go to the pair
+        the serial search would pick. The result is stored in this searcher's
+        transposition table so the next iteration starts from it.
+        """
+        entry = self.tt.get((game.board.hash, True))
+        hint = entry[3] if entry else None
+        moves = self.get_prioritized_moves(game, self.limit)
+        pairs = iter(self.root_pairs(game, moves, depth, hint))
+        
+        best_score, best_moves = NEG_INF, []
+        in_flight = deque()
+        first = next(pairs, None)
+        if first is not None:
+            in_flight.append((first, pool.submit(_search_root_pair, first, depth, best_score)))
+        while in_flight:
+            pair, future = in_flight.popleft()
+            score, explored, pruned = future.result()
+            self.nodes_explored += explored
+            self.nodes_pruned += pruned
+            if not best_moves or score > best_score:
+                best_score, best_moves = score, list(pair)
+            
+            # Nothing beats a win: the serial root cuts here too (beta <= alpha)
+            cancelled = self.cancel is not None and self.cancel.is_set()
+            while not cancelled and best_score < POS_INF and len(in_flight) < self.workers:
+                pair = next(pairs, None)
+                if pair is None:
+                    break
+                in_flight.append((pair, pool.submit(_search_root_pair, pair, depth, best_score)))
+        
+        self.store_tt((game.board.hash, True), depth, best_score, EXACT, best_moves)
+        return best_score, best_moves
+
+    def place_pair(self, pair, stone):
+        # Play both stones of a pair for the search. Stones go through the
+        # board so its hashes, bitboards and empty-cell counter (used by
+        # is_draw) stay in sync; last_row/last_col are left on the second
+        # stone, and the node that places pairs restores them once at its end
+        game = self.game
+        place, discard = game.board.place_move, game.available_moves.discard
+        (x1, y1), (x2, y2) = pair
+        place(x1, y1, stone)
+        place(x2, y2, stone)
+        discard((x1, y1))
+        discard((x2, y2))
+        game.last_row, game.last_col = x2, y2
+
+    def remove_pair(self, pair):
+        game = self.game
+        undo, add = game.board.undo_move, game.available_moves.add
+        (x1, y1), (x2, y2) = pair
+        undo(x2, y2)
+        undo(x1, y1)
+        add((x1, y1))
+        add((x2, y2))
\ No newline at end of file
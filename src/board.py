@@ -1,6 +1,99 @@
 # src/board.py
+import random
 import src.constants as c
+
+ZOBRIST_SEED = 20240601
+
+# Integer codes of Board.cells
+EMPTY_CODE = 0
+STONE_CODES = {c.PLAYER: 1, c.AI: 2}
+BORDER_CODE = 3
+_zobrist_tables = {}
+
+
+def zobrist_table(size):
+    """
+    Return the Zobrist keys for a board size as {player: [key per cell]}.
+    Cells are indexed as x * size + y. Keys come from a fixed seed so hashes
+    are reproducible between runs, and are generated once per board size.
+    """
+    table = _zobrist_tables.get(size)
+    if table is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        table = {
+            player: [rng.getrandbits(64) for _ in range(size * size)]
+            for player in (c.PLAYER, c.AI)
+        }
+        _zobrist_tables[size] = table
+    return table
+
+
+_neighbor_tables = {}
+
+
+def neighbor_table(size, radius=c.NEIGHBOR_RADIUS):
+    """
+    Return, for every cell index x * size + y, a tuple of the (nx, ny) cells
+    within radius (default NEIGHBOR_RADIUS) of it, the cell itself excluded.
+    Built once per board size and radius so candidate generation never
+    redoes the bounds arithmetic.
+    """
+    table = _neighbor_tables.get((size, radius))
+    if table is None:
+        table = []
+        for x in range(size):
+            for y in range(size):
+                table.append(tuple(
+                    (nx, ny)
+                    for nx in range(max(0, x - radius), min(size, x + radius + 1))
+                    for ny in range(max(0, y - radius), min(size, y + radius + 1))
+                    if nx != x or ny != y
+                ))
+        _neighbor_tables[(size, radius)] = table
+    return table
+
+
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+_line_tables = {}
+
+
+def line_table(size):
+    """
+    Return (lines, cell_lines, salts) for a board size.
+    lines holds every full line of the board as a (direction, cells) pair,
+    with direction from DIRECTIONS and cells in order along it.
+    cell_lines[x * size + y] gives the ids of the four lines through a cell,
+    in DIRECTIONS order, and salts the random starting hash of each line,
+    so equal stones on different lines never share a line hash.
+    """
+    table = _line_tables.get(size)
+    if table is None:
+        lines = []
+        cell_lines = [[None] * len(DIRECTIONS) for _ in range(size * size)]
+        for d, (dx, dy) in enumerate(DIRECTIONS):
+            for x in range(size):
+                for y in range(size):
+                    # Start a line only at the first in-bounds cell
+                    if 0 <= x - dx < size and 0 <= y - dy < size:
+                        continue
+                    cells = []
+                    i, j = x, y
+                    while 0 <= i < size and 0 <= j < size:
+                        cell_lines[i * size + j][d] = len(lines)
+                        cells.append((i, j))
+                        i, j = i + dx, j + dy
+                    lines.append(((dx, dy), tuple(cells)))
+        rng = random.Random(f"{ZOBRIST_SEED}-lines-{size}")
+        salts = [rng.getrandbits(64) for _ in lines]
+        table = (lines, [tuple(ids) for ids in cell_lines], salts)
+        _line_tables[size] = table
+    return table
+
+
 class Board:
+    # Number of copy() calls, so a copy that slips into a hot path shows up
+    copies = 0
+
     def __init__(self, size=c.BOARD_SIZE):
         """
         Initialize the board with a given size (default 19x19).
@@ -9,6 +102,31 @@ class Board:
         self.size = size
         self.grid = [['.' for _ in range(size)] for _ in range(size)]
         self.empty_cells = size * size  # Track empty cells for efficient draw checking
+        # Zobrist hash of the stones on the board, updated on every place/undo
+        self.zobrist = zobrist_table(size)
+        self.hash = 0
+        # Occupied cells, so candidate generation only looks around stones
+        self.stones = set()
+        self.neighbors = neighbor_table(size)
+        # Hash of the stones on every line, kept like the board hash so
+        # evaluations can reuse the score of a line they have seen before
+        self.lines, self.cell_lines, salts = line_table(size)
+        self.line_hashes = list(salts)
+        # One bitboard per player, bit x * stride + y set for each stone.
+        # The stride leaves a spare zero column after every row so line
+        # shifts in has_six never wrap from one row into the next.
+        self.stride = size + 1
+        self.bitboards = {c.PLAYER: 0, c.AI: 0}
+        self.on_board = sum(((1 << size) - 1) << (x * self.stride) for x in range(size))
+        # Flat copy of grid with integer stone codes, framed by a one-cell
+        # border of BORDER_CODE so line walks stop without bounds checks.
+        # Cell (x, y) is at (x + 1) * width + y + 1.
+        self.width = size + 2
+        self.codes = STONE_CODES
+        self.cells = bytearray([BORDER_CODE]) * (self.width * self.width)
+        for x in range(size):
+            start = (x + 1) * self.width + 1
+            self.cells[start:start + size] = bytes(size)
 
     def display(self):
         """
@@ -58,32 +176,94 @@ class Board:
             return False
         self.grid[x][y] = player
         self.empty_cells -= 1  # Decrement empty cells counter
+        index = x * self.size + y
+        key = self.zobrist[player][index]
+        self.hash ^= key
+        line_hashes = self.line_hashes
+        for line in self.cell_lines[index]:
+            line_hashes[line] ^= key
+        self.stones.add((x, y))
+        self.bitboards[player] |= 1 << (x * self.stride + y)
+        self.cells[(x + 1) * self.width + y + 1] = self.codes[player]
         return True
         
     def undo_move(self, x, y):
         """
         Undo a previously placed move and restore the empty cell count.
         """
-        if self.grid[x][y] != c.EMPTY:
+        player = self.grid[x][y]
+        if player != c.EMPTY:
             self.grid[x][y] = c.EMPTY
             self.empty_cells += 1
+            index = x * self.size + y
+            key = self.zobrist[player][index]
+            self.hash ^= key
+            line_hashes = self.line_hashes
+            for line in self.cell_lines[index]:
+                line_hashes[line] ^= key
+            self.stones.discard((x, y))
+            self.bitboards[player] ^= 1 << (x * self.stride + y)
+            self.cells[(x + 1) * self.width + y + 1] = EMPTY_CODE
             return True
         return False
 
-    def is_full(self):
+    def get_candidate_moves(self):
+        """
+        Return the set of empty cells within NEIGHBOR_RADIUS of any stone.
+        place_move/undo_move run at every search leaf, so they only keep the
+        set of stones up to date; the neighbourhood is built here from the
+        precomputed neighbour table when a search node asks for it.
+        """
+        neighbors = self.neighbors
+        size = self.size
+        candidates = set()
+        for x, y in self.stones:
+            candidates.update(neighbors[x * size + y])
+        candidates -= self.stones
+        return candidates
+
+    def has_six(self, player):
         """
-        Check if the board is completely filled.
-        This is used to detect a draw condition.
-        Optimized to use empty_cells counter for O(1) check.
+        Return True if player has six or more stones in a row anywhere.
+        For each direction, AND-ing the bitboard with itself shifted by one,
+        two and two more steps leaves a bit set only where a run of six starts.
         """
-        return self.empty_cells == 0
-    
-    def get_empty_cells_count(self):
+        bb = self.bitboards[player]
+        stride = self.stride
+        for d in (1, stride, stride + 1, stride - 1):
+            run = bb & (bb >> d)
+            run &= run >> (2 * d)
+            if run & (run >> (2 * d)):
+                return True
+        return False
+
+    def threatens_six(self, player):
         """
-        Get the number of empty cells remaining on the board.
-        Returns the count of empty cells.
+        Return True if player could complete six with one turn of two stones:
+        some six-cell window holds at least four of player's stones and none
+        of the opponent's. Windows come from the same shift-AND as has_six,
+        run on the cells the opponent does not hold; the stone count per
+        window is a bitwise adder over the six shifted bitboards.
         """
-        return self.empty_cells
+        bb = self.bitboards[player]
+        opponent = c.AI if player == c.PLAYER else c.PLAYER
+        free = self.on_board & ~self.bitboards[opponent]
+        stride = self.stride
+        for d in (1, stride, stride + 1, stride - 1):
+            window = free & (free >> d)
+            window &= window >> (2 * d)
+            window &= window >> (2 * d)
+            if not window:
+                continue
+            b0, b1, b2 = bb, bb >> d, bb >> (2 * d)
+            b3, b4, b5 = bb >> (3 * d), bb >> (4 * d), bb >> (5 * d)
+            # Stones in the window = s1 + s2 + 2 * (c1 + c2); four or more
+            # means both carries, or one carry and both sums
+            s1, c1 = b0 ^ b1 ^ b2, (b0 & b1) | (b2 & (b0 ^ b1))
+            s2, c2 = b3 ^ b4 ^ b5, (b3 & b4) | (b5 & (b3 ^ b4))
+            if window & ((c1 & c2) | ((c1 ^ c2) & s1 & s2)):
+                return True
+        return False
 
     def copy(self):
         """
@@ -91,8 +271,14 @@ class Board:
         This will be useful later for AI algorithms like Minimax
         that simulate possible moves.
         """
-        import copy
+        Board.copies += 1
         new_board = Board(self.size)
-        new_board.grid = copy.deepcopy(self.grid)
+        # Rows hold only immutable strings, so copying each row is enough
+        new_board.grid = [row[:] for row in self.grid]
         new_board.empty_cells = self.empty_cells  # Copy the empty cells counter
+        new_board.hash = self.hash
+        new_board.line_hashes = list(self.line_hashes)
+        new_board.stones = set(self.stones)
+        new_board.bitboards = dict(self.bitboards)
+        new_board.cells = bytearray(self.cells)
         return new_board
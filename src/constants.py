@@ -1,6 +1,22 @@
 ALPHA_BETA_DEPTH = 3
 MINI_MAX_DEPTH = 1
 MAX_CANDIDATES = 12
+# Empty cells within this Chebyshev distance of a stone are search candidates
+NEIGHBOR_RADIUS = 2
+# Seconds after which iterative deepening stops starting deeper iterations
+ALPHA_BETA_TIME_LIMIT = 10
+# Worker processes for the alpha-beta root search (1 searches in-process, None = one per CPU)
+ALPHA_BETA_WORKERS = 1
+# Half-width of the aspiration window around the score from two iterations back (same parity, 0 = off)
+ALPHA_BETA_ASPIRATION = 1000
+# Null-move pruning in alpha-beta (switch off for exact tactical checks). It is tried at
+# nodes below the root with four or more plies left, so only searches of depth 5+ use it
+ALPHA_BETA_NULL_MOVE = True
+# Second stones kept per first stone at the alpha-beta root (0 = off, every pair is searched).
+# Forward pruning; winning pairs and pairs that stop the human's six are always kept
+ALPHA_BETA_ROOT_PARTNERS = 8
+# Print search statistics and the AI's chosen moves after every AI move
+DEBUG = False
 
 
 BOARD_SIZE = 19
@@ -1,6 +1,13 @@
 # src/game_logic.py
 
+import src.constants as c
 from src.board import Board
+from src.heuristics import heuristic_1, heuristic_2
+from src.minimax import minimax
+from src.alpha_beta import AlphaBetaPruning
+
+# Evaluations kept by evaluate_position before its cache is cleared
+EVAL_CACHE_SIZE = 1 << 20
 
 class Connect6Game:
     def __init__(self, size=19, human_player='X', ai_player='O', ai_algorithm='minimax', heuristic='heuristic_1'):
@@ -25,7 +32,27 @@ class Connect6Game:
         self.last_col = None
         # Maintain a set of available moves for O(1) access instead of O(n^2) scanning
         self.available_moves = {(i, j) for i in range(size) for j in range(size)}
+        # State saved by do_moves so undo_moves can restore it
+        self._undo_stack = []
+        # evaluate_position results by (board hash, heuristic)
+        self._eval_cache = {}
+
 
+    def reset(self):
+        """
+        Start a new game on an empty board of the same size. The players, AI
+        settings and evaluation cache are kept: cached scores only depend on
+        the position, and early positions recur from game to game.
+        """
+        self.board = Board(self.board.size)
+        self.current_player = 'X'
+        self.first_move = True
+        self.last_row = None
+        self.last_col = None
+        self.available_moves = {(i, j) for i in range(self.board.size) for j in range(self.board.size)}
+        self._undo_stack = []
+        if hasattr(self, "last_human_moves"):
+            del self.last_human_moves
 
     def set_ai_config(self, algorithm, heuristic):
         """
@@ -78,21 +105,20 @@ class Connect6Game:
         Returns:
             True if the game is a draw, False otherwise.
         """
+        # Searches call this at every node, so read the board's empty-cell
+        # counter once and settle the common case (two or more free) first
+        empty_count = self.board.empty_cells
+        if empty_count > 1:
+            return False
+        
         # Check if board is full
-        if self.board.is_full():
+        if not empty_count:
             return True
         
         # Check for the special case: even board size, 1 empty cell, not first move
-        empty_count = self.board.get_empty_cells_count()
-        board_size_even = (self.board.size % 2 == 0)
-        requires_two_moves = not self.first_move
-        
-        if board_size_even and empty_count == 1 and requires_two_moves:
-            return True
-        
-        return False
+        return self.board.size % 2 == 0 and not self.first_move
 
-    def get_ai_move(self, depth=2):
+    def get_ai_move(self, depth=2, cancel=None):
         """
         Get the AI's move using the specified algorithm.
         
@@ -102,6 +128,9 @@ class Connect6Game:
         Args:
             depth: The depth to search in the game tree (default 3)
                   Higher depth = stronger AI but slower computation
+            cancel: Optional threading.Event. Setting it (from another
+                  thread) makes the search stop early; the moves returned
+                  then are not worth playing.
         
         Returns:
             List of moves [(x1, y1), (x2, y2)] for the AI to play.
@@ -111,8 +140,7 @@ class Connect6Game:
         TODO: This method needs to be implemented to call the actual algorithms.
         Currently returns a placeholder that picks the first available moves.
         """
-        available_moves = self.get_available_moves()
-        if not available_moves:
+        if not self.available_moves:
             return []
         
         required_moves = 1 if self.first_move else 2
@@ -122,14 +150,11 @@ class Connect6Game:
         # Currently they return placeholder values, so the AI will use a fallback strategy
         try:
             if self.ai_algorithm == 'minimax':
-                from src.minimax import minimax
                 # minimax returns (score, moves). Unpack properly.
-                result = minimax(self, depth, True)
+                result = minimax(self, depth, True, verbose=c.DEBUG, cancel=cancel)
                 # Debug: show raw minimax return so we can verify the moves used
-                try:
+                if c.DEBUG:
                     print(f"[get_ai_move] minimax raw result: {result}")
-                except Exception:
-                    pass
                 if isinstance(result, tuple) and len(result) == 2:
                     _, best_moves = result
                 else:
@@ -138,26 +163,19 @@ class Connect6Game:
                 # If algorithm returns valid moves, use them
                 if best_moves and len(best_moves) == required_moves:
                     # Validate that all moves are still available
-                    if all(move in available_moves for move in best_moves):
+                    if all(move in self.available_moves for move in best_moves):
                         # Display chosen moves (1-based coords for user clarity)
-                        try:
-                            disp = [(m[0] + 1, m[1] + 1) for m in best_moves]
-                            print(f"AI chooses: {disp}")
-                        except Exception:
-                            print(f"AI chooses: {best_moves}")
+                        if c.DEBUG:
+                            print(f"AI chooses: {[(m[0] + 1, m[1] + 1) for m in best_moves]}")
                         return best_moves
             elif self.ai_algorithm == 'alpha_beta':
-                from src.alpha_beta import AlphaBetaPruning
-                best_moves = AlphaBetaPruning(self, self.heuristic,depth).find_best_move(self)
+                best_moves = AlphaBetaPruning(self, self.heuristic, depth, cancel=cancel).find_best_move(self)
                 # If algorithm returns valid moves, use them
                 if best_moves and len(best_moves) == required_moves:
                     # Validate that all moves are still available
-                    if all(move in available_moves for move in best_moves):
-                        try:
-                            disp = [(m[0] + 1, m[1] + 1) for m in best_moves]
-                            print(f"AI chooses: {disp}")
-                        except Exception:
-                            print(f"AI chooses: {best_moves}")
+                    if all(move in self.available_moves for move in best_moves):
+                        if c.DEBUG:
+                            print(f"AI chooses: {[(m[0] + 1, m[1] + 1) for m in best_moves]}")
                         return best_moves
         except Exception as e:
             # If algorithm implementation has errors, fall back to simple strategy
@@ -166,15 +184,12 @@ class Connect6Game:
         # Fallback: If algorithms are not implemented or return invalid moves,
         # use a simple strategy (pick first available moves)
         # TODO: Remove this fallback once algorithms are fully implemented
-        chosen = available_moves[:required_moves]
-        try:
-            disp = [(m[0] + 1, m[1] + 1) for m in chosen]
-            print(f"AI chooses (fallback): {disp}")
-        except Exception:
-            print(f"AI chooses (fallback): {chosen}")
+        chosen = self.get_available_moves()[:required_moves]
+        if c.DEBUG:
+            print(f"AI chooses (fallback): {[(m[0] + 1, m[1] + 1) for m in chosen]}")
         return chosen
 
-    def evaluate_position(self):
+    def evaluate_position(self, heuristic=None):
         """
         Evaluate the current board position from the AI's perspective.
         
@@ -183,18 +198,55 @@ class Connect6Game:
         - Negative values: Good for human (minimizing player)
         - Zero: Neutral position
         
+        Searches reach the same position through different move orders, so
+        scores are cached by the board's Zobrist hash and computed once.
+        
+        Args:
+            heuristic: Heuristic to evaluate with (default: self.heuristic)
+        
         Returns:
             A numerical score representing the position's value.
         """
-        from src.heuristics import heuristic_1, heuristic_2
+        if heuristic is None:
+            heuristic = self.heuristic
+        key = (self.board.hash, heuristic)
+        score = self._eval_cache.get(key)
+        if score is not None:
+            return score
         
-        if self.heuristic == 'heuristic_1':
-            return heuristic_1(self)
-        elif self.heuristic == 'heuristic_2':
-            return heuristic_2(self)
+        if heuristic == 'heuristic_2':
+            score = heuristic_2(self)
         else:
-            # Default to heuristic_1 if invalid
-            return heuristic_1(self)
+            # heuristic_1, also the default if invalid
+            score = heuristic_1(self)
+        
+        if len(self._eval_cache) >= EVAL_CACHE_SIZE:
+            self._eval_cache.clear()
+        self._eval_cache[key] = score
+        return score
+
+    def copy(self):
+        """
+        Return an independent copy of the game state, so a search can run on
+        it while this game stays untouched. The evaluation cache is shared:
+        its scores only depend on the position and the heuristic.
+        """
+        new_game = Connect6Game(
+            size=self.board.size,
+            human_player=self.human_player,
+            ai_player=self.ai_player,
+            ai_algorithm=self.ai_algorithm,
+            heuristic=self.heuristic
+        )
+        new_game.board = self.board.copy()
+        new_game.current_player = self.current_player
+        new_game.first_move = self.first_move
+        new_game.last_row, new_game.last_col = self.last_row, self.last_col
+        new_game.available_moves = self.available_moves.copy()
+        if hasattr(self, "last_human_moves"):
+            new_game.last_human_moves = set(self.last_human_moves)
+        new_game._eval_cache = self._eval_cache
+        return new_game
 
     def make_move_copy(self, moves, player):
         """
@@ -247,8 +299,57 @@ class Connect6Game:
 
         return new_game
 
+    def do_moves(self, moves, player):
+        """
+        Apply moves for `player` in place, without validation or win checks.
+        This is the in-place counterpart of make_move_copy used by the search
+        algorithms: it updates the same state as play_turn and pushes what is
+        needed to restore it onto an undo stack.
+
+        Args:
+            moves: List of (x, y) tuples to apply
+            player: The player making the moves ('X' or 'O')
+        """
+        self._undo_stack.append((
+            moves,
+            self.current_player,
+            self.first_move,
+            self.last_row,
+            self.last_col,
+            getattr(self, "last_human_moves", None),
+        ))
+        for x, y in moves:
+            self.board.place_move(x, y, player)
+            self._remove_move(x, y)
+
+        self.first_move = False
+        if moves:
+            self.last_row, self.last_col = moves[-1]
+        if player == self.human_player:
+            self.last_human_moves = set(moves)
+        elif hasattr(self, "last_human_moves"):
+            # Like make_move_copy, whose copies only know the human's stones
+            # when the human made the move
+            del self.last_human_moves
+        self.current_player = 'O' if player == 'X' else 'X'
+
+    def undo_moves(self):
+        """Undo the most recent do_moves call and restore the previous state."""
+        moves, current_player, first_move, last_row, last_col, last_human_moves = self._undo_stack.pop()
+        for x, y in moves:
+            self.board.undo_move(x, y)
+            self._add_move(x, y)
+
+        self.current_player = current_player
+        self.first_move = first_move
+        self.last_row = last_row
+        self.last_col = last_col
+        if last_human_moves is not None:
+            self.last_human_moves = last_human_moves
+        elif hasattr(self, "last_human_moves"):
+            del self.last_human_moves
+
     def check_winner(self, x, y):
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
         # Determine which player's stone is at (x, y). This makes the check
         # independent of `self.current_player` and safe to call on simulated
         # game states where `current_player` might have been switched.
@@ -257,22 +358,9 @@ class Connect6Game:
         player = self.board.grid[x][y]
         if player == '.':
             return False
-
-        for dx, dy in directions:
-            count = 1
-            i, j = x + dx, y + dy
-            while 0 <= i < self.board.size and 0 <= j < self.board.size and \
-                  self.board.grid[i][j] == player:
-                count += 1
-                i += dx; j += dy
-            i, j = x - dx, y - dy
-            while 0 <= i < self.board.size and 0 <= j < self.board.size and \
-                  self.board.grid[i][j] == player:
-                count += 1
-                i -= dx; j -= dy
-            if count >= 6:
-                return True
-        return False
+        # Bitboard scan over the whole board: also catches a six completed by
+        # the other stone of the same turn.
+        return self.board.has_six(player)
 
     def _validate_moves_atomic(self, moves):
         """
@@ -1,10 +1,16 @@
 # src/gui.py
 
+import threading
 import tkinter as tk
 import src.constants as c
 from tkinter import messagebox, simpledialog
 from src.game_logic import Connect6Game
 
+# Milliseconds between checks for a finished AI search
+AI_POLL_MS = 50
+# Milliseconds a rejected click's message stays red in the status label
+REJECT_FLASH_MS = 600
+
 
 class Connect6GUI:
     @staticmethod
@@ -67,9 +73,13 @@ class Connect6GUI:
         self.size = size
         self.cell_size = 25  # Size of each cell in pixels
         self.margin = self.cell_size  # Space around the board for labels/border
+        # Pixel centre of each row (y) and column (x), shared by stones and highlights
+        self.centers = [self.margin + i * self.cell_size + self.cell_size // 2 for i in range(size)]
         self.selected_moves = []  # Moves selected in current turn
         self.last_human_turn = None  # Data needed to undo last human move if AI choice is cancelled
         self.game_over = False
+        self.game_number = 0  # Counts resets, so a late AI move from an old game is dropped
+        self.ai_cancel = None  # Event that stops the running AI search, if any
         self.human_player = human_player
         self.ai_player = ai_player
         
@@ -83,13 +93,19 @@ class Connect6GUI:
         main_frame.pack()
         
         # Status label
+        # Set through set_status, which skips unchanged text
+        self.status_var = tk.StringVar(
+            value=f"Your turn (Player {self.human_player}) - Place 1 stone"
+        )
         self.status_label = tk.Label(
             main_frame,
-            text=f"Your turn (Player {self.human_player}) - Place 1 stone",
+            textvariable=self.status_var,
             font=("Arial", 12, "bold"),
             pady=10
         )
         self.status_label.pack()
+        self.status_fg = self.status_label.cget("fg")
+        self.flash_job = None  # Pending end_flash call, if a rejection is shown
         
         # Canvas for the board
         board_pixel_size = self.size * self.cell_size
@@ -104,8 +120,17 @@ class Connect6GUI:
         )
         self.canvas.pack(padx=5, pady=5)
         self.canvas.bind("<Button-1>", self.on_cell_click)
-        
-        # Draw the grid
+        self.canvas.bind("<Motion>", self.on_mouse_move)
+        self.canvas.bind("<Leave>", lambda event: self.hide_ghost())
+        
+        # Draw the board once; afterwards only stones and selections change
+        self.stone_ids = {}  # (x, y) -> canvas id of the stone drawn there
+        self.draw_board()
+        # Preview of a stone under the mouse, moved around rather than redrawn
+        self.ghost_id = self.canvas.create_oval(
+            0, 0, 0, 0, state="hidden", outline="gray", dash=(2, 2)
+        )
+        self.ghost_cell = None
         self.draw_grid()
         
         # Control buttons frame
@@ -134,20 +159,30 @@ class Connect6GUI:
         )
         clear_button.pack(side=tk.LEFT, padx=5)
         
+        # Confirm button, only shown once a full turn is selected (see update_status)
+        self.confirm_button = tk.Button(
+            button_frame,
+            text="Confirm Moves",
+            command=self.confirm_selection,
+            font=("Arial", 10, "bold"),
+            padx=10,
+            pady=5
+        )
+        self.root.bind("<Return>", lambda event: self.confirm_selection())
+        self.root.bind("<Escape>", lambda event: self.clear_selection())
+        
         # Instructions label
         instructions = tk.Label(
             main_frame,
-            text="Click on empty cells to place stones. First move: 1 stone, then 2 stones per turn. AI will play automatically after your turn.",
+            text="Click on empty cells to place stones, then Confirm Moves (Enter) or Clear Selection (Esc). First move: 1 stone, then 2 stones per turn. AI will play automatically after your turn.",
             font=("Arial", 9),
             fg="gray",
             wraplength=400
         )
         instructions.pack(pady=5)
     
-    def draw_grid(self):
-        """Draw the grid lines on the canvas."""
-        self.canvas.delete("all")
-        
+    def draw_board(self):
+        """Draw the border, grid lines and labels, which never change."""
         board_start = self.margin
         board_end = self.margin + self.size * self.cell_size
         line_start = board_start + self.cell_size // 2
@@ -163,41 +198,45 @@ class Connect6GUI:
             width=3
         )
 
-        # Draw grid lines
+        # Draw grid lines, one polyline per direction. Each polyline snakes
+        # down one line and up the next; the steps between lines run along
+        # the outermost grid lines, which are drawn there anyway.
+        vertical = []
+        horizontal = []
         for i in range(self.size):
-            # Vertical lines
-            x = line_start + i * self.cell_size
-            self.canvas.create_line(
-                x, line_start,
-                x, line_end,
-                fill="black",
-                width=1
-            )
-            # Horizontal lines
-            y = line_start + i * self.cell_size
-            self.canvas.create_line(
-                line_start, y,
-                line_end, y,
-                fill="black",
-                width=1
-            )
+            position = line_start + i * self.cell_size
+            ends = (line_start, line_end) if i % 2 == 0 else (line_end, line_start)
+            vertical += [position, ends[0], position, ends[1]]
+            horizontal += [ends[0], position, ends[1], position]
+        self.canvas.create_line(*vertical, fill="black", width=1)
+        self.canvas.create_line(*horizontal, fill="black", width=1)
 
         self.draw_labels()
-        
-        # Draw stones
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.game.board.grid[i][j] != '.':
-                    self.draw_stone(i, j, self.game.board.grid[i][j])
+    
+    def draw_grid(self):
+        """
+        Bring the stones and selection on the canvas up to date with the game.
+        Only stones that were placed or removed since the last call are drawn
+        or deleted, found by comparing the board's set of stones with the
+        stones on the canvas.
+        """
+        stones = self.game.board.stones
+        grid = self.game.board.grid
+        self.hide_ghost()
+        for x, y in self.stone_ids.keys() - stones:
+            self.canvas.delete(self.stone_ids.pop((x, y)))
+        for x, y in stones - self.stone_ids.keys():
+            self.stone_ids[(x, y)] = self.draw_stone(x, y, grid[x][y])
         
         # Highlight selected moves
+        self.canvas.delete("selection")
         for x, y in self.selected_moves:
             self.highlight_cell(x, y)
     
     def draw_stone(self, x, y, player):
         """Draw a stone at position (x, y) for the given player."""
-        center_x = self.margin + y * self.cell_size + self.cell_size // 2
-        center_y = self.margin + x * self.cell_size + self.cell_size // 2
+        center_x = self.centers[y]
+        center_y = self.centers[x]
         radius = self.cell_size // 2 - 2
         
         if player == 'X':
@@ -206,7 +245,7 @@ class Connect6GUI:
             color = "white"
         
         # Draw stone with a slight shadow effect
-        self.canvas.create_oval(
+        return self.canvas.create_oval(
             center_x - radius, center_y - radius,
             center_x + radius, center_y + radius,
             fill=color, outline="black", width=1
@@ -214,67 +253,108 @@ class Connect6GUI:
     
     def highlight_cell(self, x, y):
         """Highlight a cell to show it's selected."""
-        center_x = self.margin + y * self.cell_size + self.cell_size // 2
-        center_y = self.margin + x * self.cell_size + self.cell_size // 2
+        center_x = self.centers[y]
+        center_y = self.centers[x]
         radius = self.cell_size // 2 - 1
         
         # Draw a circle to indicate selection
         self.canvas.create_oval(
             center_x - radius, center_y - radius,
             center_x + radius, center_y + radius,
-            outline="red", width=2, fill="", dash=(3, 3)
+            outline="red", width=2, fill="", dash=(3, 3), tags="selection"
         )
     
     def on_cell_click(self, event):
         """Handle mouse click on the canvas."""
         if self.game_over:
             return
+        game = self.game
+        selected_moves = self.selected_moves
         
         # Only allow clicks during human player's turn
-        if not self.game.is_human_turn():
-            messagebox.showinfo("Not Your Turn", "Please wait for the AI to make its move.")
+        if not game.is_human_turn():
+            self.flash_rejection("Not your turn - please wait for the AI to make its move.")
             return
         
-        # Convert pixel coordinates to grid coordinates
-        board_start = self.margin
-        board_end = self.margin + self.size * self.cell_size
-
-        if not (board_start <= event.x < board_end and board_start <= event.y < board_end):
+        # The turn is fully selected: it waits to be confirmed or cleared
+        required_moves = 1 if game.first_move else 2
+        if len(selected_moves) >= required_moves:
             return
-
-        col = int((event.x - board_start) // self.cell_size)
-        row = int((event.y - board_start) // self.cell_size)
         
-        # Check if click is within bounds
-        if not (0 <= row < self.size and 0 <= col < self.size):
+        cell = self.cell_at(event)
+        if cell is None:
             return
+        row, col = cell
         
         # Check if cell is already occupied
-        if self.game.board.grid[row][col] != '.':
-            messagebox.showwarning("Invalid Move", "This cell is already occupied!")
+        if game.board.grid[row][col] != '.':
+            self.flash_rejection("Invalid move - this cell is already occupied!")
             return
         
         # Check if this move is already selected
-        if (row, col) in self.selected_moves:
-            messagebox.showwarning("Invalid Move", "This cell is already selected for this turn!")
+        if cell in selected_moves:
+            self.flash_rejection("Invalid move - this cell is already selected for this turn!")
             return
         
-        required_moves = 1 if self.game.first_move else 2
-        
         # Add to selection
-        self.selected_moves.append((row, col))
+        selected_moves.append(cell)
         
-        # Update display
+        # Update display (shows the confirm button once the turn is complete)
         self.draw_grid()
+        self.update_status()
+    
+    def cell_at(self, event):
+        """Return the (row, col) of the cell under a mouse event, or None if off the board."""
+        # Convert pixel coordinates to grid coordinates
+        board_start = self.margin
+        board_end = self.margin + self.size * self.cell_size
+
+        if not (board_start <= event.x < board_end and board_start <= event.y < board_end):
+            return None
+
+        col = int((event.x - board_start) // self.cell_size)
+        row = int((event.y - board_start) // self.cell_size)
         
-        # If we have the required number of moves, play the turn
-        if len(self.selected_moves) == required_moves:
-            if self.confirm_selection():
-                self.play_turn()
-            else:
-                self.selected_moves = []
-                self.update_status()
-                self.draw_grid()
+        # Check if the cell is within bounds
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return None
+        return row, col
+    
+    def on_mouse_move(self, event):
+        """Show the ghost stone over the empty cell under the mouse, if it can be selected."""
+        cell = self.cell_at(event)
+        if cell == self.ghost_cell:
+            return
+        required_moves = 1 if self.game.first_move else 2
+        if (
+            cell is None or
+            self.game_over or
+            not self.game.is_human_turn() or
+            len(self.selected_moves) >= required_moves or
+            cell in self.selected_moves or
+            self.game.board.grid[cell[0]][cell[1]] != '.'
+        ):
+            self.hide_ghost()
+            return
+        
+        row, col = cell
+        center_x = self.centers[col]
+        center_y = self.centers[row]
+        radius = self.cell_size // 2 - 2
+        self.canvas.coords(
+            self.ghost_id,
+            center_x - radius, center_y - radius,
+            center_x + radius, center_y + radius
+        )
+        if self.ghost_cell is None:
+            self.canvas.itemconfigure(self.ghost_id, state="normal")
+        self.ghost_cell = cell
+    
+    def hide_ghost(self):
+        """Hide the ghost stone."""
+        if self.ghost_cell is not None:
+            self.canvas.itemconfigure(self.ghost_id, state="hidden")
+            self.ghost_cell = None
     
     def play_turn(self):
         """Play the selected moves for the human player, then trigger AI move if game continues."""
@@ -283,38 +363,18 @@ class Connect6GUI:
         if self.game.is_human_turn():
             human_turn_state = self._capture_human_turn_state()
 
-        if self.game.play_turn(self.selected_moves):
-            # Game ended (win or draw)
-            self.game_over = True
+        ended = self.game.play_turn(self.selected_moves)
+        self.selected_moves = []
+        self.finish_move(ended)
+        if ended or self.game.is_human_turn():
+            # The game is over, or the turn was invalid and current player is
+            # still human. Discard undo data.
             self.last_human_turn = None
-            self.draw_grid()
-            self.update_status()
-            
-            # Show win/draw message
-            if self.game.is_draw():
-                messagebox.showinfo("Game Over", "It's a draw!")
-            else:
-                # Winner is the current player (game logic doesn't switch on win)
-                winner = self.game.current_player
-                if winner == self.human_player:
-                    messagebox.showinfo("Game Over", "Congratulations! You win!")
-                else:
-                    messagebox.showinfo("Game Over", f"AI (Player {self.ai_player}) wins!")
-        else:
-            # If the turn was invalid, current player is still human. Discard undo data.
-            if self.game.is_human_turn():
-                self.last_human_turn = None
-
-            # Game continues - clear selection and update display
-            self.selected_moves = []
-            self.update_status()
-            self.draw_grid()
-            
-            # If it's now AI's turn, ask user to choose algorithm first
-            if self.game.is_ai_turn() and not self.game_over:
-                self.last_human_turn = human_turn_state
-                # Show dialog to choose AI algorithm
-                self.choose_ai_algorithm()
+        elif self.game.is_ai_turn():
+            # It's now AI's turn, ask user to choose algorithm first
+            self.last_human_turn = human_turn_state
+            # Show dialog to choose AI algorithm
+            self.choose_ai_algorithm()
     
     def choose_ai_algorithm(self):
         """Show a dialog to let the user choose the AI algorithm for this turn."""
@@ -406,8 +466,8 @@ class Connect6GUI:
         Get and play the AI's move.
         
         This method:
-        1. Calls game.get_ai_move() to get the AI's move from the algorithm
-        2. Plays the move using game.play_turn()
+        1. Calls game.get_ai_move() on a copy of the game, in a worker thread
+        2. Plays the move using game.play_turn() (see finish_ai_turn)
         3. Updates the display
         4. Checks if game is over
         """
@@ -421,66 +481,124 @@ class Connect6GUI:
         algorithm_name = self.game.ai_algorithm
         heuristic_name = self.game.heuristic.replace('_', ' ').title()
         algorithm_display = algorithm_name.replace('_', ' ').title()
-        self.status_label.config(
-            text=f"AI (Player {self.ai_player}) is thinking using {algorithm_display} with {heuristic_name}..."
+        self.set_status(
+            f"AI (Player {self.ai_player}) is thinking using {algorithm_display} with {heuristic_name}..."
         )
-        self.root.update()  # Force GUI update
         
-        # Get AI move from the algorithm
+        # Search a copy of the game on a worker thread, so the window keeps
+        # repainting and its buttons keep working while the AI thinks. The
+        # thread is a daemon so closing the window does not wait for it, and
+        # New Game stops it through ai_cancel.
         ai_depth = c.MINI_MAX_DEPTH if self.game.ai_algorithm == 'minimax' else c.ALPHA_BETA_DEPTH 
-        ai_moves = self.game.get_ai_move(depth=ai_depth)  # depth can be adjusted for AI strength
+        search_game = self.game.copy()
+        result = {}
+        cancel = self.ai_cancel = threading.Event()
+        
+        def search():
+            result["moves"] = search_game.get_ai_move(depth=ai_depth, cancel=cancel)  # depth can be adjusted for AI strength
         
+        thread = threading.Thread(target=search, daemon=True)
+        thread.start()
+        self.root.after(AI_POLL_MS, self.finish_ai_turn, self.game_number, thread, result)
+    
+    def finish_ai_turn(self, game_number, thread, result):
+        """Play the AI's move once its search thread is done."""
+        if thread.is_alive():
+            self.root.after(AI_POLL_MS, self.finish_ai_turn, game_number, thread, result)
+            return
+        # A new game was started while the AI was thinking
+        if game_number != self.game_number or self.game_over:
+            return
+        
+        ai_moves = result.get("moves")
         if not ai_moves:
             # No valid moves available (shouldn't happen in normal play)
             messagebox.showwarning("AI Error", "AI could not find a valid move!")
             return
         
-        # Play the AI's move
-        if self.game.play_turn(ai_moves):
-            # Game ended (win or draw)
+        # Play the AI's move; if the game continues it's human player's turn again
+        self.finish_move(self.game.play_turn(ai_moves))
+
+    def finish_move(self, ended):
+        """
+        Update the display after a turn was played, by either player.
+        ended is game.play_turn's result: True if the turn won or drew the game.
+        """
+        if ended:
             self.game_over = True
-            self.draw_grid()
-            self.update_status()
-            
-            # Show win/draw message
-            if self.game.is_draw():
-                messagebox.showinfo("Game Over", "It's a draw!")
-            else:
-                winner = self.game.current_player
-                if winner == self.human_player:
-                    messagebox.showinfo("Game Over", "Congratulations! You win!")
-                else:
-                    messagebox.showinfo("Game Over", f"AI (Player {self.ai_player}) wins!")
+        self.draw_grid()
+        self.update_status()
+        if not ended:
+            return
+        
+        # Show win/draw message
+        if self.game.is_draw():
+            messagebox.showinfo("Game Over", "It's a draw!")
         else:
-            # Game continues - update display
-            self.update_status()
-            self.draw_grid()
-            # Now it's human player's turn again
+            # Winner is the current player (game logic doesn't switch on win)
+            winner = self.game.current_player
+            if winner == self.human_player:
+                messagebox.showinfo("Game Over", "Congratulations! You win!")
+            else:
+                messagebox.showinfo("Game Over", f"AI (Player {self.ai_player}) wins!")
 
     def update_status(self):
-        """Update the status label."""
+        """Update the status label and show the confirm button when it applies."""
+        game = self.game
+        selected_count = len(self.selected_moves)
+        required_moves = 1 if game.first_move else 2
+        is_human_turn = game.is_human_turn()
+        
+        # Same test as selection_complete, from the values read above
+        if not self.game_over and is_human_turn and selected_count == required_moves:
+            self.confirm_button.pack(side=tk.LEFT, padx=5)
+        else:
+            self.confirm_button.pack_forget()
         if self.game_over:
-            if self.game.is_draw():
-                self.status_label.config(text="Game Over - It's a draw!")
+            if game.is_draw():
+                self.set_status("Game Over - It's a draw!")
             else:
-                winner = self.game.current_player
+                winner = game.current_player
                 if winner == self.human_player:
-                    self.status_label.config(text="Game Over - You win!")
+                    self.set_status("Game Over - You win!")
                 else:
-                    self.status_label.config(text=f"Game Over - AI (Player {self.ai_player}) wins!")
+                    self.set_status(f"Game Over - AI (Player {self.ai_player}) wins!")
         else:
-            required_moves = 1 if self.game.first_move else 2
-            if self.game.is_human_turn():
+            if is_human_turn:
                 moves_text = f"Place {required_moves} stone(s)"
-                if self.selected_moves:
-                    moves_text += f" ({len(self.selected_moves)}/{required_moves} selected)"
-                self.status_label.config(
-                    text=f"Your turn (Player {self.human_player}) - {moves_text}"
-                )
+                if selected_count:
+                    moves_text += f" ({selected_count}/{required_moves} selected)"
+                if selected_count == required_moves:
+                    moves_text += " - Confirm (Enter) or Clear (Esc)"
+                self.set_status(f"Your turn (Player {self.human_player}) - {moves_text}")
             else:
-                self.status_label.config(
-                    text=f"AI (Player {self.ai_player}) is thinking..."
-                )
+                self.set_status(f"AI (Player {self.ai_player}) is thinking...")
+    
+    def flash_rejection(self, reason):
+        """
+        Show why a click was rejected in red in the status label, then go
+        back to the normal status. Unlike a message box this does not block
+        the window, so quick misclicks cost nothing.
+        """
+        if self.flash_job is not None:
+            self.root.after_cancel(self.flash_job)
+        self.set_status(reason)
+        self.status_label.config(fg="red")
+        self.flash_job = self.root.after(REJECT_FLASH_MS, self.end_flash)
+    
+    def end_flash(self):
+        """
+        Undo flash_rejection. The status is rebuilt from the current game
+        state, as the turn may have changed while the message was shown.
+        """
+        self.flash_job = None
+        self.status_label.config(fg=self.status_fg)
+        self.update_status()
+    
+    def set_status(self, text):
+        """Show text in the status label, unless it is already showing."""
+        if text != self.status_var.get():
+            self.status_var.set(text)
     
     def clear_selection(self):
         """Clear the current selection."""
@@ -491,13 +609,12 @@ class Connect6GUI:
     
     def reset_game(self):
         """Reset the game to initial state."""
-        self.game = Connect6Game(
-            size=self.size,
-            human_player=self.human_player,
-            ai_player=self.ai_player,
-            ai_algorithm=self.game.ai_algorithm,
-            heuristic=self.game.heuristic
-        )
+        # Stop an AI search of the old game, so it does not compete with the next one
+        if self.ai_cancel is not None:
+            self.ai_cancel.set()
+            self.ai_cancel = None
+        self.game.reset()
+        self.game_number += 1
         self.selected_moves = []
         self.last_human_turn = None
         self.game_over = False
@@ -544,15 +661,23 @@ class Connect6GUI:
                 font=label_font
             )
 
-    def confirm_selection(self):
-        """Ask the player to confirm the selected moves before playing."""
-        moves_text = ", ".join(
-            f"({row + 1}, {col + 1})" for row, col in self.selected_moves
-        )
-        return messagebox.askyesno(
-            "Confirm Moves",
-            f"Play moves {moves_text}?"
+    def selection_complete(self):
+        """True while the human has selected a full turn that is not played yet."""
+        required_moves = 1 if self.game.first_move else 2
+        return (
+            not self.game_over and
+            self.game.is_human_turn() and
+            len(self.selected_moves) == required_moves
         )
+
+    def confirm_selection(self):
+        """
+        Play the selected moves, from the Confirm Moves button or Enter.
+        The buttons sit on the main window, so unlike a dialog, confirming
+        does not start a nested modal event loop.
+        """
+        if self.selection_complete():
+            self.play_turn()
     
     def run(self):
         """Start the GUI main loop."""
@@ -5,8 +5,63 @@ Heuristic functions for evaluating Connect 6 game positions.
 
 These functions analyze the board and return a score representing
 the position's value from the AI's perspective.
+
+Both heuristics are sums of independent per-line scores. The board keeps a
+hash of the stones on each of its lines (see Board.line_hashes), so a line
+is only scored the first time its contents are seen; after that its score
+comes from a cache and an evaluation is one lookup per line.
 """
 
+# Line scores kept per (line scorer, AI symbol); cleared when this large
+LINE_CACHE_SIZE = 1 << 20
+_line_caches = {}
+
+
+def _evaluate_lines(game_state, score_line):
+    """
+    Sum score_line over every line of the board, using cached line scores.
+    """
+    board = game_state.board
+    ai_player = game_state.ai_player
+    cache = _line_caches.get((score_line, ai_player))
+    if cache is None:
+        cache = _line_caches[(score_line, ai_player)] = {}
+
+    line_hashes = board.line_hashes
+    try:
+        return sum(map(cache.__getitem__, line_hashes))
+    except KeyError:
+        pass
+
+    # Some line is new: score the missing ones and fill the cache
+    if len(cache) > LINE_CACHE_SIZE:
+        cache.clear()
+    grid = board.grid
+    size = board.size
+    score = 0
+    for line, line_hash in zip(board.lines, line_hashes):
+        line_score = cache.get(line_hash)
+        if line_score is None:
+            line_score = cache[line_hash] = score_line(grid, line, ai_player, size)
+        score += line_score
+    return score
+
+
+def _runs(grid, cells):
+    """
+    Yield (start, count, player) for every maximal run of stones along cells.
+    """
+    run_player, start = '.', 0
+    for k, (x, y) in enumerate(cells):
+        cell = grid[x][y]
+        if cell != run_player:
+            if run_player != '.':
+                yield start, k - start, run_player
+            run_player, start = cell, k
+    if run_player != '.':
+        yield start, len(cells) - start, run_player
+
+
 def heuristic_1(game_state):
     """
     First heuristic: Count sequences of stones in a row.
@@ -22,46 +77,26 @@ def heuristic_1(game_state):
     Returns:
         A numerical score (positive = good for AI, negative = good for human)
     """
-    score = 0
-    directions = [(1, 0), (0, 1), (1, 1), (1, -1)]  # horizontal, vertical, diagonal, anti-diagonal
-    size = game_state.board.size
-    
+    return _evaluate_lines(game_state, _score_line_1)
+
+
+def _score_line_1(grid, line, ai_player, size):
+    """
+    heuristic_1's score for one line of the board.
+    """
     # Weights for different sequence lengths
     weights = {2: 1, 3: 10, 4: 100, 5: 1000}
     
-    # Check all positions on the board
-    for i in range(size):
-        for j in range(size):
-            if game_state.board.grid[i][j] == '.':
-                continue
-            
-            player = game_state.board.grid[i][j]
-            is_ai = (player == game_state.ai_player)
-            
-            # Check each direction
-            for dx, dy in directions:
-                count = 1
-                # Count in positive direction
-                x, y = i + dx, j + dy
-                while 0 <= x < size and 0 <= y < size and game_state.board.grid[x][y] == player:
-                    count += 1
-                    x += dx
-                    y += dy
-                
-                # Count in negative direction
-                x, y = i - dx, j - dy
-                while 0 <= x < size and 0 <= y < size and game_state.board.grid[x][y] == player:
-                    count += 1
-                    x -= dx
-                    y -= dy
-                
-                # Only count sequences of 2-5 (6+ means game is over)
-                if 2 <= count <= 5:
-                    weight = weights.get(count, 0)
-                    if is_ai:
-                        score += weight
-                    else:
-                        score -= weight
+    score = 0
+    _, cells = line
+    for start, count, player in _runs(grid, cells):
+        # Only count sequences of 2-5 (6+ means game is over).
+        # Every stone of the run sees the same length, hence count *.
+        if 2 <= count <= 5:
+            if player == ai_player:
+                score += count * weights[count]
+            else:
+                score -= count * weights[count]
     
     return score
 
@@ -82,9 +117,15 @@ def heuristic_2(game_state):
     Returns:
         A numerical score (positive = good for AI, negative = good for human)
     """
-    score = 0
-    directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-    size = game_state.board.size
+    return _evaluate_lines(game_state, _score_line_2)
+
+
+def _score_line_2(grid, line, ai_player, size):
+    """
+    heuristic_2's score for one line of the board.
+    The center bonus is per stone, so only the horizontal lines (direction
+    (0, 1)) add it, which counts every stone exactly once.
+    """
     center = size // 2
     
     # Weights for different sequence lengths
@@ -92,84 +133,41 @@ def heuristic_2(game_state):
     threat_weight = 7000  # Very high weight for threats (increase)
     open4_weight = 1500    # Weight for open-4 threats (needs blocking)
     
-    # Check all positions on the board
-    for i in range(size):
-        for j in range(size):
-            if game_state.board.grid[i][j] == '.':
-                continue
-            
-            player = game_state.board.grid[i][j]
-            is_ai = (player == game_state.ai_player)
-            
-            # Center control bonus (positions closer to center are better)
-            distance_from_center = abs(i - center) + abs(j - center)
-            center_bonus = (size - distance_from_center) * 0.1
-            if is_ai:
-                score += center_bonus
-            else:
-                score -= center_bonus
-            
-            # Check each direction
-            for dx, dy in directions:
-                count = 1
-                # Count in positive direction
-                x, y = i + dx, j + dy
-                while 0 <= x < size and 0 <= y < size and game_state.board.grid[x][y] == player:
-                    count += 1
-                    x += dx
-                    y += dy
-                
-                # Count in negative direction
-                x, y = i - dx, j - dy
-                while 0 <= x < size and 0 <= y < size and game_state.board.grid[x][y] == player:
-                    count += 1
-                    x -= dx
-                    y -= dy
-                
-                # Count sequences
-                if 2 <= count <= 5:
-                    weight = weights.get(count, 0)
-                    if is_ai:
-                        score += weight
-                    else:
-                        score -= weight
-                
-                # Check for threats (5 in a row with an open end)
-                if count == 5:
-                    # Check if there's an open space at either end
-                    end1_x, end1_y = i + dx * count, j + dy * count
-                    end2_x, end2_y = i - dx * count, j - dy * count
-                    
-                    threat_detected = False
-                    if (0 <= end1_x < size and 0 <= end1_y < size and 
-                        game_state.board.grid[end1_x][end1_y] == '.'):
-                        threat_detected = True
-                    if (0 <= end2_x < size and 0 <= end2_y < size and 
-                        game_state.board.grid[end2_x][end2_y] == '.'):
-                        threat_detected = True
-                    
-                    if threat_detected:
-                        if is_ai:
-                            score += threat_weight
-                        else:
-                            score -= threat_weight
-
-                # Check for open-4 (four in a row with at least one open end)
-                if count == 4:
-                    end1_x, end1_y = i + dx * count, j + dy * count
-                    end2_x, end2_y = i - dx * count, j - dy * count
-                    open_end = False
-                    if (0 <= end1_x < size and 0 <= end1_y < size and
-                        game_state.board.grid[end1_x][end1_y] == '.'):
-                        open_end = True
-                    if (0 <= end2_x < size and 0 <= end2_y < size and
-                        game_state.board.grid[end2_x][end2_y] == '.'):
-                        open_end = True
-                    if open_end:
-                        if is_ai:
-                            score += open4_weight
-                        else:
-                            score -= open4_weight
+    score = 0
+    center_score = 0
+    direction, cells = line
+    length = len(cells)
+    for start, count, player in _runs(grid, cells):
+        sign = 1 if player == ai_player else -1
+        
+        # Center control bonus (positions closer to center are better),
+        # summed in tenths and scaled once at the end
+        if direction == (0, 1):
+            for x, y in cells[start:start + count]:
+                center_score += sign * (size - abs(x - center) - abs(y - center))
+        
+        # Count sequences
+        if not 2 <= count <= 5:
+            continue
+        run_score = count * weights[count]
+        
+        # Check for threats (5 in a row with an open end) and open-4s
+        # (four in a row with at least one open end). Each stone of the
+        # run looks count cells ahead of and behind itself.
+        if count >= 4:
+            weight = threat_weight if count == 5 else open4_weight
+            for k in range(start, start + count):
+                ahead, behind = k + count, k - count
+                if ahead < length:
+                    x, y = cells[ahead]
+                    if grid[x][y] == '.':
+                        run_score += weight
+                        continue
+                if behind >= 0:
+                    x, y = cells[behind]
+                    if grid[x][y] == '.':
+                        run_score += weight
+        
+        score += sign * run_score
     
-    return score
-
+    return score + center_score * 0.1
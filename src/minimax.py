@@ -1,10 +1,12 @@
 # src/minimax.py
 import time
 from itertools import combinations
-from src.constants import MAX_CANDIDATES
+from src.board import neighbor_table
+from src.constants import MAX_CANDIDATES, NEIGHBOR_RADIUS
 
 INF = 10**9
-DEFAULT_RADIUS = 2
+NEG_INF = -INF
+DEFAULT_RADIUS = NEIGHBOR_RADIUS
 HUMAN_FOCUS_RADIUS = 3   # prefer searching near last human move when available
 
 # Normalization/clamping thresholds used when ordering and at leaves.
@@ -21,30 +23,22 @@ def _chebyshev(a, b):
 def get_candidate_moves(game, radius=DEFAULT_RADIUS):
     """Return candidate empty cells for search.
 
-    This implementation reuses `game.get_available_moves()` and the board
-    rather than scanning the whole file independently.
+    For the default radius this is the board's neighbourhood of its stones;
+    other radii gather the same neighbourhood from a table for that radius.
     """
-    grid = game.board.grid
-    n = game.board.size
-
-    # Build occupied cells set from the grid (small cost, still simpler than
-    # reimplementing board bookkeeping here). Use available_moves for final
-    # filtering so we never return invalid cells.
-    occupied = {(i, j) for i in range(n) for j in range(n) if grid[i][j] != '.'}
-    avail = set(game.get_available_moves())
-
-    # If no occupied cells, return all available moves (first moves)
-    if not occupied:
-        return sorted(avail)
-
-    candidates = set()
-    for c in avail:
-        # include empty cell if it's within chebyshev `radius` of any occupied cell
-        for o in occupied:
-            if _chebyshev(c, o) <= radius:
-                candidates.add(c)
-                break
+    avail = game.available_moves
 
+    if radius == NEIGHBOR_RADIUS:
+        candidates = game.board.get_candidate_moves() & avail
+    else:
+        n = game.board.size
+        neighbors = neighbor_table(n, radius)
+        candidates = set()
+        for x, y in game.board.stones:
+            candidates.update(neighbors[x * n + y])
+        candidates &= avail
+
+    # No stones yet (first moves) or nothing nearby: every available move
     if not candidates:
         return sorted(avail)
     return sorted(candidates)
@@ -57,9 +51,8 @@ def get_candidate_moves_near_last_human(game, radius=HUMAN_FOCUS_RADIUS):
     `last_human_moves` if present (set/list), otherwise fall back to
     `last_row`/`last_col`. Returns a set of coords.
     """
-    grid = game.board.grid
     n = game.board.size
-    avail = set(game.get_available_moves())
+    avail = game.available_moves
 
     origins = set()
     if hasattr(game, "last_human_moves") and game.last_human_moves:
@@ -70,45 +63,63 @@ def get_candidate_moves_near_last_human(game, radius=HUMAN_FOCUS_RADIUS):
     if not origins:
         return set()
 
+    # The origins' neighbourhoods come from a table, not a distance check
+    # of every empty cell against every origin
+    neighbors = neighbor_table(n, radius)
     candidates = set()
-    for c in avail:
-        for o in origins:
-            if _chebyshev(c, o) <= radius:
-                candidates.add(c)
-                break
-
-    return candidates
+    for x, y in origins:
+        candidates.update(neighbors[x * n + y])
 
-def board_state_key(game):
-    grid = game.board.grid
-    rows = [''.join(row) for row in grid]
-    return '|'.join(rows) + f":{game.current_player}:{int(game.first_move)}"
+    return candidates & avail
 
 def is_win_after_placement(sim_game, coord):
     x, y = coord
     return sim_game.check_winner(x, y)
 
-# small caches to reduce repeated expensive ops
-_SIM_CACHE = {}
-_PROBE_CACHE = {}
+def wins_with(game, moves, player):
+    """Place `moves` for `player` in place, report whether any of them completes six, then undo."""
+    game.do_moves(moves, player)
+    try:
+        return any(is_win_after_placement(game, m) for m in moves)
+    finally:
+        game.undo_moves()
+
+def find_two_move_win(game, firsts, player, origins):
+    """Return the first pair (a, b) with `a` in `firsts` that completes six for `player`, or None.
 
-def simulate(game, moves, player):
-    """Use the game's `make_move_copy` (already provided in `game_logic`) and cache results."""
-    bk = board_state_key(game)
-    key = (bk, tuple(moves), player)
-    if key in _SIM_CACHE:
-        return _SIM_CACHE[key]
-    child = game.make_move_copy(moves, player)
-    _SIM_CACHE[key] = child
-    return child
+    Second stones are only tried within HUMAN_FOCUS_RADIUS of `a` or of any
+    of `origins` (the last human stones). Callers have already ruled out
+    single-stone wins.
+    """
+    # wins_with adds and removes stones, so iterate over a snapshot
+    avail = list(game.available_moves)
+    n = game.board.size
+    neighbors = neighbor_table(n, HUMAN_FOCUS_RADIUS)
+    # Nearness to the origins does not depend on `a`: work it out once
+    near_origins = set()
+    for x, y in origins:
+        near_origins.update(neighbors[x * n + y])
+    for a in firsts:
+        near_a = set(neighbors[a[0] * n + a[1]])
+        for b in avail:
+            if b == a:
+                continue
+            if b in near_origins or b in near_a:
+                if wins_with(game, [a, b], player):
+                    return a, b
+    return None
+
+def probe_after(game, moves, player):
+    """Cached evaluation of the position after `player` plays `moves` (the game is left unchanged)."""
+    game.do_moves(moves, player)
+    try:
+        return probe_score_cached(game)
+    finally:
+        game.undo_moves()
 
 def probe_score_cached(game):
-    bk = board_state_key(game)
-    if bk in _PROBE_CACHE:
-        return _PROBE_CACHE[bk]
-    val = game.evaluate_position()
-    _PROBE_CACHE[bk] = val
-    return val
+    """Evaluation of the current position; the game caches it by Zobrist hash."""
+    return game.evaluate_position()
 
 
 def _clamp_for_ordering(v: float) -> float:
@@ -139,12 +150,14 @@ def _clamp_for_leaf(v: float) -> float:
         return 0.0
 
 def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
-            max_candidates=MAX_CANDIDATES, max_second_per_first=6, verbose=True):
+            max_candidates=MAX_CANDIDATES, max_second_per_first=6, verbose=True, cancel=None):
     """
     Minimal minimax:
       - depth: recursion depth (0 == evaluate_position)
       - maximizing_player: True if root is maximizing (AI)
       - verbose: prints stats to console (time, depth, node count)
+      - cancel: optional threading.Event; once set, every node returns at
+        once and the result is meaningless (the caller has given up on it)
     Behavior change: if game.last_human_moves exists, restrict candidates to Chebyshev distance
     HUMAN_FOCUS_RADIUS from the last human stone(s). If that produces no candidates, fall back.
     """
@@ -152,7 +165,9 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
     required = 2
     root_player = game.current_player
 
-    avail = list(game.get_available_moves())
+    # A fresh list, so the checks below can iterate it while they place stones
+    avail = game.get_available_moves()
+    avail_set = game.available_moves
     if len(avail) <= required:
         elapsed = time.time() - t0
         stats = {"time": elapsed, "depth": depth, "nodes": 0}
@@ -179,8 +194,7 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
     for m in avail:
         try:
             # Simulate opponent move
-            sim = simulate(game, [m], opponent)
-            if is_win_after_placement(sim, m):
+            if wins_with(game, [m], opponent):
                 immediate_blockers.add(m)
         except Exception:
             pass
@@ -199,11 +213,11 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
         return 0, chosen_blockers
     if focused_candidates:
         # keep order deterministic and only consider those actually available
-        candidates = [c for c in sorted(focused_candidates) if c in avail]
+        candidates = [c for c in sorted(focused_candidates) if c in avail_set]
     else:
         # fallback to general candidate selection
         candidates = get_candidate_moves(game, radius)
-        candidates = [c for c in candidates if c in avail]
+        candidates = [c for c in candidates if c in avail_set]
 
     if not candidates:
         candidates = avail
@@ -217,7 +231,7 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
 
     def _dist_to_orig(c):
         if not origins:
-            return float('inf')
+            return INF
         return min(_chebyshev(c, o) for o in origins)
 
     # Pre-score candidates by a combination of proximity and cached probe score.
@@ -228,8 +242,7 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
         d = _dist_to_orig(c)
         # Use cached probe score on the single-move child as an approximation
         try:
-            child = simulate(game, [c], root_player)
-            ps = probe_score_cached(child)
+            ps = probe_after(game, [c], root_player)
         except Exception:
             ps = 0
         ps_order = _clamp_for_ordering(ps)
@@ -246,8 +259,7 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
     # Check single-move opponent wins across all available moves (cheap)
     try:
         for b in avail:
-            child_b = simulate(game, [b], opponent)
-            if is_win_after_placement(child_b, b):
+            if wins_with(game, [b], opponent):
                 blocking_moves.add(b)
     except Exception:
         pass
@@ -256,10 +268,8 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
     if req_opp == 2 and not blocking_moves:
         try:
             # limit pair checking to the (pre-scored) candidates to reduce cost
-            from itertools import combinations as _comb
-            for a, b in _comb([c for c in candidates], 2):
-                child_ab = simulate(game, [a, b], opponent)
-                if is_win_after_placement(child_ab, a) or is_win_after_placement(child_ab, b):
+            for a, b in combinations(candidates, 2):
+                if wins_with(game, [a, b], opponent):
                     blocking_moves.add(a)
                     blocking_moves.add(b)
         except Exception:
@@ -272,62 +282,23 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
     # full O(n^2) pair scan while catching many practical threats.
     if req_opp == 2 and not blocking_moves:
         try:
-            for a in avail:
-                # simulate opponent placing `a`
-                child_a = simulate(game, [a], opponent)
-                # quickly skip if placing `a` already loses (shouldn't)
-                if is_win_after_placement(child_a, a):
-                    blocking_moves.add(a)
-                    continue
-
-                # Consider b's that are within HUMAN_FOCUS_RADIUS of `a` or
-                # within HUMAN_FOCUS_RADIUS of any last human move (if present).
-                local_avail2 = list(child_a.get_available_moves())
-                origins2 = set()
-                if hasattr(game, "last_human_moves") and game.last_human_moves:
-                    origins2.update(game.last_human_moves)
-                elif getattr(game, "last_row", None) is not None and getattr(game, "last_col", None) is not None:
-                    origins2.add((game.last_row, game.last_col))
-
-                # build candidate b-list: nearby to `a` or to known origins
-                b_candidates = []
-                for b in local_avail2:
-                    if _chebyshev(b, a) <= HUMAN_FOCUS_RADIUS:
-                        b_candidates.append(b)
-                        continue
-                    for o in origins2:
-                        if _chebyshev(b, o) <= HUMAN_FOCUS_RADIUS:
-                            b_candidates.append(b)
-                            break
-
-                # check second moves
-                for b in b_candidates:
-                    child_ab = simulate(child_a, [b], opponent)
-                    if is_win_after_placement(child_ab, b) or is_win_after_placement(child_ab, a):
-                        blocking_moves.add(a)
-                        blocking_moves.add(b)
-                        break
-                if blocking_moves:
-                    break
+            pair = find_two_move_win(game, avail, opponent, origins)
+            if pair:
+                blocking_moves.update(pair)
         except Exception:
             pass
 
         # If we still found nothing, and the board is not too large, fall back
         # to a full pair scan among all available moves (more expensive but
         # catches threats our locality heuristic missed). Limit to moderate
-        # boards to avoid pathological slowdowns.
+        # boards to avoid pathological slowdowns. Stone order within a turn
+        # does not matter, so each unordered pair is tried once.
         if req_opp == 2 and not blocking_moves and len(avail) <= 120:
             try:
-                for a in avail:
-                    for b in avail:
-                        if b == a:
-                            continue
-                        child_ab = simulate(game, [a, b], opponent)
-                        if is_win_after_placement(child_ab, a) or is_win_after_placement(child_ab, b):
-                            blocking_moves.add(a)
-                            blocking_moves.add(b)
-                            break
-                    if blocking_moves:
+                for a, b in combinations(avail, 2):
+                    if wins_with(game, [a, b], opponent):
+                        blocking_moves.add(a)
+                        blocking_moves.add(b)
                         break
             except Exception:
                 pass
@@ -359,8 +330,7 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
 
     # Step 3: Check for immediate AI win (1 move)
     for a in candidates:
-        child = simulate(game, [a], root_player)
-        if is_win_after_placement(child, a):
+        if wins_with(game, [a], root_player):
              # Found a winning move. Return it (pair it with any other move)
             elapsed = time.time() - t0
             setattr(game, "_last_minimax_stats", {"time": elapsed, "depth": depth, "nodes": 1})
@@ -379,37 +349,42 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
 
     node_count = 0
 
-    def recurse(node_game, depth_left, maximizing):
+    # The search walks the tree in place on `game` with do_moves/undo_moves
+    # instead of copying the game for every child.
+    def recurse(depth_left, maximizing):
         nonlocal node_count
         node_count += 1
 
-        if node_game.is_draw():
+        if cancel is not None and cancel.is_set():
+            return 0, None
+        if game.is_draw():
             return 0, None
         if depth_left == 0:
-            v = probe_score_cached(node_game)
+            v = probe_score_cached(game)
             # Preserve exact infinities (winning positions) but clamp ordinary evals
             return _clamp_for_leaf(v), None
 
         req = 2
-        local_avail = list(node_game.get_available_moves())
+        # The game's live set of empty cells: O(1) membership, no copy per node
+        local_avail = game.available_moves
 
         # same focused behavior recursively: prefer to keep search local to last human moves
-        focused = get_candidate_moves_near_last_human(node_game, HUMAN_FOCUS_RADIUS)
+        focused = get_candidate_moves_near_last_human(game, HUMAN_FOCUS_RADIUS)
         if focused:
             local_cand = [c for c in sorted(focused) if c in local_avail]
         else:
-            local_cand = get_candidate_moves(node_game, radius)
+            local_cand = get_candidate_moves(game, radius)
             local_cand = [c for c in local_cand if c in local_avail]
 
         if not local_cand:
-            local_cand = local_avail
+            local_cand = list(local_avail)
         if max_candidates and len(local_cand) > max_candidates:
             local_cand = local_cand[:max_candidates]
 
         if not local_cand:
-            return probe_score_cached(node_game), None
+            return probe_score_cached(game), None
 
-        best_score = -INF if maximizing else INF
+        best_score = NEG_INF if maximizing else INF
         best_moves = None
 
         # Pair generation and scoring (Simpler, unified approach)
@@ -425,23 +400,30 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
                         pair_candidates.append((a, b))
         
         # Score pairs for sorting (Beam search preparation)
+        mover = game.current_player
         scored_pairs = []
         for a, b in pair_candidates:
-            # Check for immediate wins first (optimization)
-            child_ab = simulate(node_game, [a, b], node_game.current_player)
-            if is_win_after_placement(child_ab, b) or is_win_after_placement(child_ab, a):
-                return (INF if maximizing else -INF), [a, b]
-            
-            ps = probe_score_cached(child_ab)
-            scored_pairs.append((_clamp_for_ordering(ps), (a, b), child_ab))
+            game.do_moves([a, b], mover)
+            try:
+                # Check for immediate wins first (optimization)
+                if is_win_after_placement(game, b) or is_win_after_placement(game, a):
+                    return (INF if maximizing else NEG_INF), [a, b]
+                ps = probe_score_cached(game)
+            finally:
+                game.undo_moves()
+            scored_pairs.append((_clamp_for_ordering(ps), (a, b)))
         
         scored_pairs.sort(reverse=maximizing, key=lambda t: t[0])
 
         max_pairs = max_second_per_first * max(1, len(local_cand))
-        for i, (_, (a, b), child_ab) in enumerate(scored_pairs):
+        for i, (_, (a, b)) in enumerate(scored_pairs):
             if i >= max_pairs:
                 break
-            sc, _ = recurse(child_ab, depth_left - 1, not maximizing)
+            game.do_moves([a, b], mover)
+            try:
+                sc, _ = recurse(depth_left - 1, not maximizing)
+            finally:
+                game.undo_moves()
             if maximizing:
                 if sc > best_score:
                     best_score = sc
@@ -453,7 +435,7 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
 
         return best_score, best_moves
 
-    best_score, best_moves = recurse(game, depth, maximizing_player)
+    best_score, best_moves = recurse(depth, maximizing_player)
 
     elapsed = time.time() - t0
     stats = {"time": elapsed, "depth": depth, "nodes": node_count}
@@ -465,10 +447,9 @@ def minimax(game, depth, maximizing_player, radius=DEFAULT_RADIUS,
         print(f"[minimax] depth={depth} nodes={node_count} time={elapsed:.4f}s (console)")
 
     req_now = 2
-    avail_now = list(game.get_available_moves())
-    if not best_moves or len(best_moves) != req_now or any(m not in avail_now for m in best_moves):
+    if not best_moves or len(best_moves) != req_now or any(m not in game.available_moves for m in best_moves):
         chosen = []
-        for c in avail_now:
+        for c in game.get_available_moves():
             if c not in chosen:
                 chosen.append(c)
             if len(chosen) == req_now:
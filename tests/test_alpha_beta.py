@@ -0,0 +1,278 @@
+# tests/test_alpha_beta.py
+import random
+from itertools import combinations
+
+import pytest
+
+import src.alpha_beta as alpha_beta
+import src.constants as c
+from src.alpha_beta import AlphaBetaPruning, NEG_INF, POS_INF
+from src.game_logic import Connect6Game
+
+
+def random_game(seed, size, stones):
+    """
+    A game with stones stones placed alternately by X and O around the
+    centre, with nobody having six, and the AI (O) to move.
+    """
+    rng = random.Random(seed)
+    while True:
+        game = Connect6Game(size=size)
+        cells = [(x, y) for x in range(1, size - 1) for y in range(1, size - 1)]
+        placed = rng.sample(cells, stones)
+        for k, (x, y) in enumerate(placed):
+            game.board.place_move(x, y, c.PLAYER if k % 2 == 0 else c.AI)
+            game._remove_move(x, y)
+        if not (game.board.has_six(c.PLAYER) or game.board.has_six(c.AI)):
+            break
+    game.first_move = False
+    game.current_player = game.ai_player
+    game.last_row, game.last_col = placed[-2]
+    return game
+
+
+def crowded_game(rng, size):
+    """A game with a random share of the cells filled, long runs included."""
+    game = Connect6Game(size=size)
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    for x, y in rng.sample(cells, rng.randint(0, size * size * 2 // 3)):
+        game.board.place_move(x, y, rng.choice((c.PLAYER, c.AI)))
+        game._remove_move(x, y)
+    game.first_move = False
+    return game
+
+
+def baseline_threat(game, x, y, player):
+    """
+    The original grid scan of check_threat_at_position: the longest line
+    player would have through (x, y), stopping at the first direction that
+    reaches six.
+    """
+    grid = game.board.grid
+    size = game.board.size
+    longest = 0
+    for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+        count = 1
+        for step in (1, -1):
+            i, j = x + step * dx, y + step * dy
+            while 0 <= i < size and 0 <= j < size and grid[i][j] == player:
+                count += 1
+                i += step * dx
+                j += step * dy
+        longest = max(longest, count)
+        if longest >= 6:
+            break
+    return longest
+
+
+def minimax_value(searcher, game, depth, maximizing):
+    """
+    Plain minimax over the same tree alpha-beta searches: every pair of the
+    searcher's candidate stones, a pair that makes six wins, and at depth 0
+    a side that can complete six next turn has won.
+    """
+    board = game.board
+    player = game.ai_player if maximizing else game.human_player
+    if board.empty_cells <= 1 and game.is_draw():
+        return 0
+    if depth == 0:
+        if board.threatens_six(player):
+            return POS_INF if maximizing else NEG_INF
+        return game.evaluate_position(searcher.heuristic)
+
+    orig_player = game.current_player
+    game.current_player = player
+    moves = searcher.get_prioritized_moves(game, searcher.limit)
+    scores = []
+    for pair in combinations(moves, 2):
+        searcher.place_pair(pair, player)
+        if board.has_six(player):
+            scores.append(POS_INF if maximizing else NEG_INF)
+        else:
+            scores.append(minimax_value(searcher, game, depth - 1, not maximizing))
+        searcher.remove_pair(pair)
+    game.current_player = orig_player
+    if maximizing:
+        return max(scores, default=NEG_INF)
+    return min(scores, default=POS_INF)
+
+
+@pytest.mark.parametrize("heuristic", [c.EVAL1, c.EVAL2])
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_alpha_beta_matches_plain_minimax(heuristic, depth):
+    # Null move and root forward pruning are the deliberately inexact parts,
+    # so they are off; the transposition table, killers, history and PVS
+    # must not change the value
+    for seed in range(4):
+        game = random_game(seed, size=7, stones=8)
+        board_hash = game.board.hash
+        reference = AlphaBetaPruning(game, heuristic, depth)
+        reference.limit = 7
+        expected = minimax_value(reference, game, depth, True)
+
+        searcher = AlphaBetaPruning(game, heuristic, depth, null_move=False, root_partners=0)
+        searcher.limit = 7
+        score, moves = searcher.alpha_beta(game, depth, NEG_INF, POS_INF, True, root=True)
+        assert score == expected
+        assert game.board.hash == board_hash
+
+        # Iterative deepening with aspiration windows and re-searches
+        searcher = AlphaBetaPruning(game, heuristic, depth, null_move=False, aspiration=50,
+                                    root_partners=0)
+        searcher.limit = 7
+        searcher.find_best_move(game)
+        assert searcher.best_score == expected
+        assert game.board.hash == board_hash
+
+
+def test_null_move_cutoffs_keep_the_minimax_value():
+    # Null moves are tried below the root with NULL_MOVE_R + 2 plies left,
+    # so depth 5 is the shallowest search that uses them. On these positions
+    # some do cut off, and the value is still the plain minimax one.
+    depth = 5
+    cutoffs = 0
+    for seed in (2, 3, 5, 6):
+        game = random_game(seed, size=7, stones=8)
+        reference = AlphaBetaPruning(game, c.EVAL1, depth)
+        reference.limit = 4
+        expected = minimax_value(reference, game, depth, True)
+
+        searcher = AlphaBetaPruning(game, c.EVAL1, depth, null_move=True, root_partners=0)
+        searcher.limit = 4
+        null_move_search = searcher.null_move_search
+
+        def counting_null_move_search(*args):
+            nonlocal cutoffs
+            score = null_move_search(*args)
+            cutoffs += score is not None
+            return score
+
+        searcher.null_move_search = counting_null_move_search
+        score, _ = searcher.alpha_beta(game, depth, NEG_INF, POS_INF, True, root=True)
+        assert score == expected
+    assert cutoffs > 0
+
+
+def test_root_pruning_keeps_every_winning_and_defending_pair():
+    # Compare the pruned root with the full list of root pairs on positions
+    # where one side could complete six next turn
+    checked = 0
+    for seed in range(60):
+        game = random_game(seed, size=9, stones=18)
+        board = game.board
+        can_win = board.threatens_six(game.ai_player)
+        must_block = board.threatens_six(game.human_player)
+        if not (can_win or must_block):
+            continue
+        searcher = AlphaBetaPruning(game, c.EVAL1, 2, root_partners=1)
+        moves = searcher.get_prioritized_moves(game, searcher.limit)
+        all_pairs = searcher.ordered_pairs(moves, 2)
+        kept = searcher.root_pairs(game, moves, 2)
+        assert len(kept) < len(all_pairs)
+        assert set(kept) <= set(all_pairs)
+        for pair in all_pairs:
+            searcher.place_pair(pair, game.ai_player)
+            wins = can_win and board.has_six(game.ai_player)
+            defends = must_block and not board.threatens_six(game.human_player)
+            searcher.remove_pair(pair)
+            if wins or defends:
+                checked += 1
+                assert pair in kept
+    assert checked > 0
+
+
+def test_parallel_root_matches_serial_search():
+    for seed in range(3):
+        scores = []
+        for workers in (1, 2):
+            game = random_game(seed, size=9, stones=10)
+            searcher = AlphaBetaPruning(game, c.EVAL1, 3, workers=workers)
+            searcher.find_best_move(game)
+            scores.append(searcher.best_score)
+        assert scores[0] is not None
+        assert scores[0] == scores[1]
+
+
+@pytest.mark.parametrize("size", [6, 9, 19])
+def test_threats_at_position_match_the_baseline_scan(size):
+    rng = random.Random(size)
+    for _ in range(40):
+        game = crowded_game(rng, size)
+        searcher = AlphaBetaPruning(game, c.EVAL1, 1)
+        for x, y in game.available_moves:
+            for player, opponent in ((c.PLAYER, c.AI), (c.AI, c.PLAYER)):
+                expected = baseline_threat(game, x, y, player)
+                assert searcher.check_threat_at_position(game, x, y, player) == expected
+                assert searcher.threats_at_position(game, x, y, player, opponent) == (
+                    expected, baseline_threat(game, x, y, opponent))
+
+
+def test_prioritized_moves_are_cached_per_position_side_and_limit(monkeypatch):
+    game = random_game(1, size=9, stones=12)
+    searcher = AlphaBetaPruning(game, c.EVAL1, 2)
+    moves = searcher.get_prioritized_moves(game, 10)
+    assert moves == searcher.rank_moves(game, 10)
+    assert searcher.get_prioritized_moves(game, 10) is moves
+
+    # Another limit or side to move is another entry
+    assert searcher.get_prioritized_moves(game, 5) == searcher.rank_moves(game, 5)
+    game.current_player = game.human_player
+    assert searcher.get_prioritized_moves(game, 10) == searcher.rank_moves(game, 10)
+    game.current_player = game.ai_player
+
+    # A transposition, reached again after other moves, hits the cache
+    pair = tuple(moves[:2])
+    searcher.place_pair(pair, game.ai_player)
+    after = searcher.get_prioritized_moves(game, 10)
+    assert after == searcher.rank_moves(game, 10)
+    searcher.remove_pair(pair)
+    assert searcher.get_prioritized_moves(game, 10) is moves
+
+    # A full cache is cleared rather than grown
+    monkeypatch.setattr(alpha_beta, "MOVE_CACHE_SIZE", 2)
+    searcher.get_prioritized_moves(game, 3)
+    assert len(searcher.move_cache) == 1
+
+
+def sorted_ranking(game, limit):
+    """
+    rank_moves as it was before bucketing: sort each category by threat,
+    concatenate and drop duplicates. Threats come from the baseline scan.
+    """
+    player = game.current_player
+    opponent = game.human_player if player == game.ai_player else game.ai_player
+    categories = [[] for _ in range(6)]
+    for x, y in game.board.get_candidate_moves():
+        mine = baseline_threat(game, x, y, player)
+        theirs = baseline_threat(game, x, y, opponent)
+        if mine >= 6:
+            categories[0].append(((x, y), 0))
+        elif theirs >= 5:
+            categories[1].append(((x, y), theirs))
+        elif theirs >= 4:
+            categories[2].append(((x, y), theirs))
+        elif mine >= 5:
+            categories[3].append(((x, y), mine))
+        elif mine >= 4:
+            categories[4].append(((x, y), mine))
+        else:
+            categories[5].append(((x, y), mine * 10 + theirs * 5))
+    result = []
+    for category in categories:
+        category.sort(key=lambda entry: entry[1], reverse=True)
+        result += [move for move, _ in category if move not in result]
+    return result[:limit] if limit else result
+
+
+def test_bucketed_ranking_matches_the_sorted_one():
+    rng = random.Random(4)
+    for _ in range(40):
+        game = crowded_game(rng, rng.choice((9, 13, 19)))
+        # Past the opening, which only takes the cells around the centre
+        if not 6 <= len(game.board.stones) <= game.board.size ** 2 - 6:
+            continue
+        searcher = AlphaBetaPruning(game, c.EVAL1, 1)
+        for player in (c.AI, c.PLAYER):
+            game.current_player = player
+            for limit in (None, 20, 5):
+                assert searcher.rank_moves(game, limit) == sorted_ranking(game, limit)
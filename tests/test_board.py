@@ -0,0 +1,93 @@
+# tests/test_board.py
+import random
+
+import pytest
+
+import src.constants as c
+from src.board import Board, DIRECTIONS
+
+PLAYERS = (c.PLAYER, c.AI)
+
+
+def random_board(rng, size, stones):
+    """A board of the given size with stones stones of random colour at random cells."""
+    board = Board(size)
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    for x, y in rng.sample(cells, stones):
+        board.place_move(x, y, rng.choice(PLAYERS))
+    return board
+
+
+def windows(size):
+    """Yield every six-cell window of a size x size board as a list of cells."""
+    for dx, dy in DIRECTIONS:
+        for x in range(size):
+            for y in range(size):
+                cells = [(x + k * dx, y + k * dy) for k in range(6)]
+                if all(0 <= i < size and 0 <= j < size for i, j in cells):
+                    yield cells
+
+
+def naive_has_six(board, player):
+    return any(
+        all(board.grid[i][j] == player for i, j in cells)
+        for cells in windows(board.size)
+    )
+
+
+def naive_threatens_six(board, player):
+    opponent = c.AI if player == c.PLAYER else c.PLAYER
+    for cells in windows(board.size):
+        stones = [board.grid[i][j] for i, j in cells]
+        if opponent not in stones and stones.count(player) >= 4:
+            return True
+    return False
+
+
+@pytest.mark.parametrize("size", [6, 7, 10, 19])
+def test_has_six_and_threatens_six_match_a_naive_scan(size):
+    rng = random.Random(size)
+    for _ in range(150):
+        board = random_board(rng, size, rng.randint(0, size * size * 3 // 4))
+        for player in PLAYERS:
+            assert board.has_six(player) == naive_has_six(board, player)
+            assert board.threatens_six(player) == naive_threatens_six(board, player)
+
+
+def test_every_line_of_six_is_found():
+    # One window at a time, including those touching the edges, where a
+    # shifted bitboard could wrap into the next row
+    size = 8
+    for cells in windows(size):
+        for player in PLAYERS:
+            board = Board(size)
+            for x, y in cells[:4]:
+                board.place_move(x, y, player)
+            assert board.threatens_six(player)
+            assert not board.has_six(player)
+            for x, y in cells[4:]:
+                board.place_move(x, y, player)
+            assert board.has_six(player)
+
+
+def test_undo_restores_every_mirror():
+    rng = random.Random(7)
+    size = 9
+    board = random_board(rng, size, 20)
+    fresh = Board(size)
+    for x, y in board.stones:
+        fresh.place_move(x, y, board.grid[x][y])
+    empty = [(x, y) for x in range(size) for y in range(size) if (x, y) not in board.stones]
+    played = rng.sample(empty, 15)
+    for x, y in played:
+        board.place_move(x, y, rng.choice(PLAYERS))
+    for x, y in reversed(played):
+        board.undo_move(x, y)
+
+    assert board.grid == fresh.grid
+    assert board.hash == fresh.hash
+    assert board.line_hashes == fresh.line_hashes
+    assert board.bitboards == fresh.bitboards
+    assert board.cells == fresh.cells
+    assert board.stones == fresh.stones
+    assert board.empty_cells == fresh.empty_cells
@@ -0,0 +1,149 @@
+# tests/test_game_logic.py
+import random
+
+import pytest
+
+import src.constants as c
+from src.game_logic import Connect6Game
+from src.minimax import minimax
+
+
+def random_game(seed, size, stones):
+    """
+    A game with stones stones placed alternately by X and O away from the
+    edges, the human having played last, and the AI (O) to move.
+    """
+    rng = random.Random(seed)
+    game = Connect6Game(size=size)
+    cells = [(x, y) for x in range(2, size - 2) for y in range(2, size - 2)]
+    placed = rng.sample(cells, stones)
+    for k, (x, y) in enumerate(placed):
+        game.board.place_move(x, y, c.PLAYER if k % 2 == 0 else c.AI)
+        game._remove_move(x, y)
+    game.first_move = False
+    game.current_player = game.ai_player
+    game.last_row, game.last_col = placed[-1]
+    game.last_human_moves = {placed[-2]}
+    return game
+
+
+def game_state(game):
+    """Every field of the game that a move changes, including the board mirrors."""
+    board = game.board
+    return (
+        [row[:] for row in board.grid],
+        board.hash,
+        list(board.line_hashes),
+        dict(board.bitboards),
+        bytes(board.cells),
+        set(board.stones),
+        board.empty_cells,
+        set(game.available_moves),
+        game.current_player,
+        game.first_move,
+        game.last_row,
+        game.last_col,
+        set(game.last_human_moves) if hasattr(game, "last_human_moves") else None,
+        len(game._undo_stack),
+    )
+
+
+def test_do_moves_and_undo_moves_restore_every_field():
+    rng = random.Random(3)
+    game = random_game(3, size=11, stones=10)
+    before = game_state(game)
+    player = game.ai_player
+    for _ in range(8):
+        moves = rng.sample(sorted(game.available_moves), 2)
+        game.do_moves(moves, player)
+        assert not set(moves) & game.available_moves
+        assert game.current_player != player
+        player = game.current_player
+    for _ in range(8):
+        game.undo_moves()
+    assert game_state(game) == before
+
+
+def test_do_moves_matches_make_move_copy():
+    game = random_game(4, size=11, stones=10)
+    for player in (game.ai_player, game.human_player):
+        moves = sorted(game.available_moves)[:2]
+        copied = game.make_move_copy(moves, player)
+        game.do_moves(moves, player)
+        assert game_state(game)[:-1] == game_state(copied)[:-1]
+        game.undo_moves()
+
+
+# minimax(game, 2, True) from the copy-based search (simulate/make_move_copy)
+# that the in-place search replaced
+COPY_SEARCH_RESULTS = [
+    ('heuristic_1', 0, 368.0, [(4, 5), (4, 6)]),
+    ('heuristic_1', 1, 2.0, [(2, 4), (3, 4)]),
+    ('heuristic_1', 2, 2.0, [(4, 3), (4, 5)]),
+    ('heuristic_1', 3, 342.0, [(6, 5), (7, 6)]),
+    ('heuristic_1', 4, -28.0, [(0, 0), (0, 1)]),
+    ('heuristic_1', 5, -2.0, [(2, 4), (2, 6)]),
+    ('heuristic_2', 0, 6368.3, [(4, 5), (4, 6)]),
+    ('heuristic_2', 1, 2.6, [(2, 4), (3, 4)]),
+    ('heuristic_2', 2, 2.0, [(4, 3), (4, 5)]),
+    ('heuristic_2', 3, 6341.7, [(6, 5), (7, 6)]),
+    ('heuristic_2', 4, -27.5, [(0, 4), (1, 3)]),
+    ('heuristic_2', 5, -1.5, [(2, 4), (2, 6)]),
+]
+
+
+@pytest.mark.parametrize("heuristic, seed, score, moves", COPY_SEARCH_RESULTS)
+def test_minimax_in_place_matches_the_copy_based_search(heuristic, seed, score, moves):
+    game = random_game(seed, size=11, stones=10)
+    game.heuristic = heuristic
+    before = game_state(game)
+    assert minimax(game, 2, True, verbose=False) == (pytest.approx(score), moves)
+    assert game_state(game) == before
+
+
+def baseline_is_draw(game):
+    """The original rule, read from the grid: a full board, or one free cell
+    on an even board when two stones are due."""
+    empty = sum(row.count('.') for row in game.board.grid)
+    return empty == 0 or (game.board.size % 2 == 0 and empty == 1 and not game.first_move)
+
+
+def check_is_draw(game):
+    first_move = game.first_move
+    for game.first_move in (True, False):
+        assert game.is_draw() == baseline_is_draw(game)
+    game.first_move = first_move
+
+
+@pytest.mark.parametrize("size", [6, 7])
+def test_is_draw_follows_the_empty_cell_counter(size):
+    rng = random.Random(size)
+    game = Connect6Game(size=size)
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    rng.shuffle(cells)
+    for x, y in cells:
+        check_is_draw(game)
+        game.do_moves([(x, y)], rng.choice((c.PLAYER, c.AI)))
+    assert game.is_draw()
+    check_is_draw(game)
+    for _ in range(3):
+        game.undo_moves()
+        check_is_draw(game)
+
+
+def test_reset_restores_every_field_of_a_new_game():
+    game = Connect6Game(size=9, ai_algorithm='alpha_beta', heuristic='heuristic_2')
+    fresh = game_state(Connect6Game(size=9))
+    game.play_turn([(4, 4)])
+    game.do_moves([(2, 2), (3, 3)], game.ai_player)
+    game.do_moves([(5, 5), (6, 6)], game.human_player)
+    game.evaluate_position()
+    cache = game._eval_cache
+    assert cache
+
+    game.reset()
+    assert game_state(game) == fresh
+    assert not hasattr(game, "last_human_moves")
+    # Settings and cached scores survive a reset
+    assert (game.ai_algorithm, game.heuristic) == ('alpha_beta', 'heuristic_2')
+    assert game._eval_cache is cache
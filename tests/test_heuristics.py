@@ -0,0 +1,90 @@
+# tests/test_heuristics.py
+import random
+
+import pytest
+
+import src.constants as c
+from src.game_logic import Connect6Game
+from src.heuristics import heuristic_1, heuristic_2
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+WEIGHTS = {2: 1, 3: 10, 4: 100, 5: 1000}
+
+
+def baseline_score(game, with_threats):
+    """
+    The original per-stone scan: for every stone and direction, the length
+    of the run through it, plus (heuristic_2) center control and threats.
+    The threat checks look count cells from the stone, not from the run's end.
+    """
+    grid = game.board.grid
+    size = game.board.size
+    center = size // 2
+
+    def empty(x, y):
+        return 0 <= x < size and 0 <= y < size and grid[x][y] == '.'
+
+    score = 0
+    for i in range(size):
+        for j in range(size):
+            player = grid[i][j]
+            if player == '.':
+                continue
+            sign = 1 if player == game.ai_player else -1
+            if with_threats:
+                score += sign * (size - abs(i - center) - abs(j - center)) * 0.1
+            for dx, dy in DIRECTIONS:
+                count = 1
+                for step in (1, -1):
+                    x, y = i + step * dx, j + step * dy
+                    while 0 <= x < size and 0 <= y < size and grid[x][y] == player:
+                        count += 1
+                        x += step * dx
+                        y += step * dy
+                if 2 <= count <= 5:
+                    score += sign * WEIGHTS[count]
+                if with_threats and count in (4, 5):
+                    if empty(i + dx * count, j + dy * count) or empty(i - dx * count, j - dy * count):
+                        score += sign * (7000 if count == 5 else 1500)
+    return score
+
+
+def random_game(rng, size, stones):
+    """A game with stones stones of random colour, in runs as well as scattered."""
+    game = Connect6Game(size=size)
+    board = game.board
+    while board.empty_cells > size * size - stones:
+        x, y = rng.randrange(size), rng.randrange(size)
+        dx, dy = rng.choice(DIRECTIONS)
+        player = rng.choice((c.PLAYER, c.AI))
+        for _ in range(rng.randint(1, 5)):
+            if 0 <= x < size and 0 <= y < size and board.grid[x][y] == '.':
+                board.place_move(x, y, player)
+                game._remove_move(x, y)
+            x, y = x + dx, y + dy
+    return game
+
+
+@pytest.mark.parametrize("size", [7, 10, 19])
+def test_heuristics_match_the_baseline_scan(size):
+    rng = random.Random(size)
+    for _ in range(60):
+        game = random_game(rng, size, rng.randint(0, size * size // 2))
+        assert heuristic_1(game) == baseline_score(game, False)
+        assert heuristic_2(game) == pytest.approx(baseline_score(game, True))
+
+
+def test_heuristics_follow_moves_and_undos():
+    # The per-line scores are cached by line hash, so scores after undoing
+    # must be the same as on a board that never had the stones
+    rng = random.Random(5)
+    game = random_game(rng, 11, 30)
+    for _ in range(40):
+        moves = rng.sample(sorted(game.available_moves), 2)
+        game.do_moves(moves, rng.choice((c.PLAYER, c.AI)))
+        assert heuristic_1(game) == baseline_score(game, False)
+        assert heuristic_2(game) == pytest.approx(baseline_score(game, True))
+        if rng.random() < 0.5:
+            game.undo_moves()
+            assert heuristic_1(game) == baseline_score(game, False)
+            assert heuristic_2(game) == pytest.approx(baseline_score(game, True))